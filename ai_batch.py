@@ -0,0 +1,125 @@
+# ai_batch.py
+import math
+import constants as C
+from rng import get_rng
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; rooms fall back to Enemy.update_ai
+    np = None
+
+BATCHING_AVAILABLE = np is not None
+
+WANDERING = 0
+CHASING = 1
+STATE_NAMES = {WANDERING: "WANDERING", CHASING: "CHASING"}
+STATE_IDS = {name: state_id for state_id, name in STATE_NAMES.items()}
+
+
+class EnemyBatch:
+    """
+    Runs Enemy.update_ai for every enemy in a room at once.
+
+    Positions, speeds, sight radii, wander vectors, timers and AI states
+    live in NumPy arrays, so distance checks, state changes, movement and
+    clamping to the room are a handful of array operations per tick instead
+    of a Python method call per enemy. Only the new rect positions are
+    written back to the sprites each tick. The rest of the AI state is
+    written back by write_back(), before the batch is thrown away.
+
+    The batch is built for a fixed set of enemies. The room rebuilds it
+    whenever one is killed or added (see matches()).
+    """
+
+    def __init__(self, enemies):
+        self.enemies = list(enemies)
+        # Exact (fractional) top-left positions, see BaseEntity.set_position
+        self.position = np.array(
+            [enemy.exact_position() for enemy in self.enemies], dtype=float
+        ).reshape(-1, 2)
+        sizes = [enemy.rect.size for enemy in self.enemies]
+        self.half_size = np.array(sizes, dtype=float).reshape(-1, 2) / 2
+        self.speed = np.array([enemy.speed for enemy in self.enemies], dtype=float)
+        self.sight_radius = np.array(
+            [enemy.sight_radius for enemy in self.enemies], dtype=float
+        )
+        self.chase_radius = np.array(
+            [enemy.chase_radius for enemy in self.enemies], dtype=float
+        )
+        self.state = np.array(
+            [STATE_IDS[enemy.state] for enemy in self.enemies], dtype=np.int8
+        )
+        self.direction = np.array(
+            [enemy.wander_direction for enemy in self.enemies], dtype=float
+        ).reshape(-1, 2)
+        self.timer = np.array(
+            [enemy.wander_timer for enemy in self.enemies], dtype=float
+        )
+        self.duration = np.array(
+            [enemy.wander_duration for enemy in self.enemies], dtype=float
+        )
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def matches(self, enemies):
+        """Returns True if the batch was built for exactly these enemies."""
+        return self.enemies == enemies.sprites()
+
+    def step(self, player, screen_width, screen_height, dt, flow_field=None):
+        """Advances every enemy by one tick, as update_ai would, then moves the sprites."""
+        centers = self.position + self.half_size
+        to_player = np.array(player.rect.center, dtype=float) - centers
+        dist_to_player = np.hypot(to_player[:, 0], to_player[:, 1])
+
+        # Enemies that change state this tick don't move until the next one
+        wandering = self.state == WANDERING
+        spotted = wandering & (dist_to_player < self.sight_radius)
+        lost = ~wandering & (dist_to_player > self.chase_radius)
+        self.state[spotted] = CHASING
+        self.state[lost] = WANDERING
+        wander = wandering & ~spotted
+        chase = ~wandering & ~lost
+
+        # Pick a new wander direction for every enemy whose timer ran out
+        self.timer[wander] += dt
+        ai_rng = get_rng("ai")
+        for i in np.flatnonzero(wander & (self.timer >= self.duration)):
+            angle = ai_rng.uniform(0, 2 * math.pi)
+            self.direction[i] = (math.cos(angle), math.sin(angle))
+            self.timer[i] = 0
+            self.duration[i] = ai_rng.randint(60, 180) / C.BASE_TICK_RATE
+
+        # Speeds are in pixels per tick at the base rate
+        step = (self.speed * (dt * C.BASE_TICK_RATE))[:, None]
+        velocity = np.zeros_like(self.position)
+        velocity[wander] = self.direction[wander] * step[wander]
+        distance = np.where(dist_to_player > 0, dist_to_player, 1)[:, None]
+        chase_direction = to_player / distance
+        if flow_field is not None:
+            # Look up every enemy's cell in the field at once
+            size = flow_field.cell_size
+            cell_x = np.clip(centers[:, 0] // size, 0, flow_field.cols - 1)
+            cell_y = np.clip(centers[:, 1] // size, 0, flow_field.rows - 1)
+            cells = (cell_y * flow_field.cols + cell_x).astype(int)
+            routed = flow_field.has_direction[cells]
+            chase_direction[routed] = flow_field.direction_array[cells[routed]]
+        velocity[chase] = chase_direction[chase] * step[chase]
+        self.position += velocity
+
+        # Keep everyone inside the room
+        max_position = (
+            np.array((screen_width, screen_height), dtype=float) - self.half_size * 2
+        )
+        np.clip(self.position, 0, max_position, out=self.position)
+
+        for enemy, (x, y) in zip(self.enemies, self.position.tolist()):
+            enemy.set_position(x, y)
+
+    def write_back(self):
+        """Copies the AI state held in the arrays back onto the Enemy objects."""
+        for i, enemy in enumerate(self.enemies):
+            enemy.state = STATE_NAMES[int(self.state[i])]
+            enemy.wander_direction = tuple(self.direction[i].tolist())
+            enemy.wander_timer = float(self.timer[i])
+            enemy.wander_duration = float(self.duration[i])
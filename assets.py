@@ -0,0 +1,139 @@
+# assets.py
+import json
+import os
+import pygame
+import constants as C
+from factories import ENEMY_TEMPLATES
+
+ATLAS_MANIFEST = "assets/atlas.json"
+
+
+class TextureAtlas:
+    """
+    A single sprite sheet produced by build_atlas.py. The sheet is decoded
+    once and every sprite is handed out as a subsurface of it.
+    """
+
+    def __init__(self, manifest_path=ATLAS_MANIFEST):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        self.sheet = pygame.image.load(manifest["image"]).convert_alpha()
+        self.regions = {
+            (path, tuple(entry["size"])): pygame.Rect(entry["rect"])
+            for path, entry in manifest["sprites"].items()
+        }
+
+    def get(self, path, size):
+        """Returns a subsurface for the sprite, or None if it was not packed at that size."""
+        region = self.regions.get((path, tuple(size)))
+        if region is None:
+            return None
+        return self.sheet.subsurface(region)
+
+
+class SpriteCache:
+    """
+    Loads, converts and scales each (path, size) sprite exactly once and hands
+    the same Surface to every entity that asks for it. Drawing onto one
+    would change that sprite for every goblin in the game, so tint or
+    flip a copy instead.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+        self.atlas = None
+        self.hits = 0
+        self.misses = 0
+
+    def load_atlas(self, manifest_path=ATLAS_MANIFEST):
+        """Serves sprites from a prebuilt atlas, if one exists. Returns True on success."""
+        if not os.path.exists(manifest_path):
+            return False
+        try:
+            self.atlas = TextureAtlas(manifest_path)
+        except (OSError, KeyError, json.JSONDecodeError, pygame.error) as e:
+            print(f"Could not load texture atlas: {e}")
+            self.atlas = None
+            return False
+        return True
+
+    def get(self, path, size=C.SPRITE_SIZE):
+        """Returns the shared, scaled surface for a sprite file."""
+        key = (path, tuple(size))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if self.atlas:
+            surface = self.atlas.get(path, key[1])
+        if surface is None:
+            # Not in the atlas, so fall back to decoding the individual file.
+            # .convert_alpha() needs the display mode to be set before the first load
+            loaded_image = pygame.image.load(path).convert_alpha()
+            surface = pygame.transform.scale(loaded_image, key[1])
+        self._surfaces[key] = surface
+        return surface
+
+    def preload(self, paths, size=C.SPRITE_SIZE):
+        """Loads a batch of sprite files up front so gameplay never hits the disk."""
+        for path in paths:
+            self.get(path, size)
+
+    def clear(self):
+        """Drops every cached surface and resets the counters."""
+        self._surfaces.clear()
+        self.atlas = None
+        self.hits = 0
+        self.misses = 0
+
+    def memory_usage(self):
+        """Returns the approximate number of bytes held by cached pixel data."""
+        # Atlas subsurfaces share the sheet's pixels, so count the sheet once instead
+        total = 0
+        if self.atlas:
+            total += self.atlas.sheet.get_pitch() * self.atlas.sheet.get_height()
+        for surface in self._surfaces.values():
+            if surface.get_parent() is None:
+                total += surface.get_pitch() * surface.get_height()
+        return total
+
+    def stats(self):
+        """Sprites cached, hits, misses, atlas use and the pixel memory held."""
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "atlas": self.atlas is not None,
+            "memory_bytes": self.memory_usage(),
+        }
+
+
+# Entities load their images through get_sprite(), which reads from here
+sprite_cache = SpriteCache()
+
+
+def get_sprite(path, size=C.SPRITE_SIZE):
+    """Returns the shared surface for a sprite file from the global cache."""
+    return sprite_cache.get(path, size)
+
+
+def preload_sprites():
+    """
+    Warms the cache with every sprite referenced by enemies.json and npcs.json,
+    using the texture atlas from build_atlas.py when it has been built.
+    """
+    sprite_cache.load_atlas()
+    paths = [
+        template["sprite"]
+        for template in ENEMY_TEMPLATES.values()
+        if template.get("sprite")
+    ]
+    with open("npcs.json", "r") as f:
+        all_npc_data = json.load(f)
+    for npc_list in all_npc_data.values():
+        paths.extend(npc["sprite"] for npc in npc_list if npc.get("sprite"))
+
+    # dict.fromkeys keeps the order while dropping duplicates
+    sprite_cache.preload(dict.fromkeys(paths))
@@ -0,0 +1,23 @@
+# attack.py
+from dataclasses import dataclass
+
+DEFAULT_MISS_MESSAGE = "{attacker} missed!"
+DEFAULT_CRIT_MESSAGE = "Critical Hit! {attacker} deals {damage} damage!"
+
+
+@dataclass(frozen=True)
+class AttackType:
+    """
+    One row of attacks.json: how an attack type changes the odds and what
+    it says. Messages are format strings filled in with {attacker},
+    {damage} and {brave} ("Bravely! " when the brave trait kicks in).
+    """
+
+    attack_id: int  # Index into factories.ATTACK_TYPES
+    key: str
+    hit_modifier: int  # Added to the hit chance, in percent
+    damage_modifier: float
+    can_crit: bool
+    hit_message: str
+    miss_message: str = DEFAULT_MISS_MESSAGE
+    crit_message: str = DEFAULT_CRIT_MESSAGE
@@ -0,0 +1,174 @@
+# bench_flowfield.py
+"""
+Flow field pathfinding benchmark.
+
+Builds rooms of several sizes with random obstacles, fills them with
+chasing enemies and reports, for each room size and enemy count:
+- how long one flow field recompute takes (paid only when the player
+  crosses into another cell),
+- how long an AI tick takes with the field, and with straight-line chasing,
+- how long it would take for every enemy to run its own path search
+  (only measured for the smaller counts, where it finishes in time).
+
+Usage:
+    python bench_flowfield.py [--ticks 120] [--seed 1] [--output bench_flowfield.json]
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import time
+import pygame
+import constants as C
+from factories import create_enemy, get_available_enemy_types
+from flowfield import FlowField
+from rng import rng
+from room import Room
+
+ROOM_SIZES = [(800, 600), (1600, 1200), (3200, 2400)]
+ENEMY_COUNTS = [10, 100, 1000]
+# Share of the room covered by obstacles
+OBSTACLE_COVERAGE = 0.15
+# Per-enemy searches get slow quickly; above this count they are skipped
+NAIVE_MAX_ENEMIES = 100
+BENCH_OUTPUT = "bench_flowfield.json"
+
+
+class Target(pygame.sprite.Sprite):
+    """A stand-in for the player: only its rect is read by the AI."""
+
+    def __init__(self, center):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = center
+
+
+def random_obstacles(width, height):
+    """Scatters wall segments until they cover OBSTACLE_COVERAGE of the room."""
+    obstacles = []
+    covered = 0
+    while covered < width * height * OBSTACLE_COVERAGE:
+        if random.random() < 0.5:
+            size = (random.randint(96, 320), C.FLOW_CELL_SIZE)
+        else:
+            size = (C.FLOW_CELL_SIZE, random.randint(96, 320))
+        x = random.randint(0, width - size[0])
+        y = random.randint(0, height - size[1])
+        obstacles.append(pygame.Rect((x, y), size))
+        covered += size[0] * size[1]
+    return obstacles
+
+
+def build_room(width, height, enemy_count, obstacles):
+    room = Room(width, height, room_type="town")
+    room.set_obstacles(obstacles)
+    enemy_types = get_available_enemy_types()
+    for _ in range(enemy_count):
+        enemy = create_enemy(
+            random.choice(enemy_types),
+            random.randint(0, width),
+            random.randint(0, height),
+        )
+        # Everyone chases, wherever they are
+        enemy.sight_radius = enemy.chase_radius = width + height
+        enemy.state = "CHASING"
+        room.add_enemy(enemy)
+    return room
+
+
+def time_ticks(room, target, ticks):
+    """Mean milliseconds per AI tick while the target walks at player speed."""
+    dt = 1 / C.BASE_TICK_RATE
+    start = time.perf_counter()
+    for _ in range(ticks):
+        target.rect.x = (target.rect.x + C.PLAYER_SPEED) % room.width
+        room.update(target, dt)
+    return (time.perf_counter() - start) / ticks * 1000
+
+
+def time_recompute(field, target, repeats=5):
+    """Mean milliseconds to rebuild the field for a new player cell."""
+    start = time.perf_counter()
+    for i in range(repeats):
+        field.target_cell = None
+        field.update((target.rect.centerx + i, target.rect.centery))
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def time_naive(room, target):
+    """Milliseconds for every enemy to run its own search, as without a shared field."""
+    field = FlowField(room.width, room.height, room.obstacles)
+    start = time.perf_counter()
+    for enemy in room.enemies:
+        # A search from each enemy's cell costs the same as the shared one
+        field.target_cell = None
+        field.update(enemy.rect.center)
+        field.direction_at(target.rect.center)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_case(width, height, enemy_count, ticks, seed):
+    random.seed(seed)
+    rng.reseed(seed)
+    obstacles = random_obstacles(width, height)
+    target = Target((width // 2, height // 2))
+    room = build_room(width, height, enemy_count, obstacles)
+    result = {
+        "cells": room.flow_field.cols * room.flow_field.rows,
+        "obstacles": len(obstacles),
+        "recompute_ms": time_recompute(room.flow_field, target),
+        "tick_flow_ms": time_ticks(room, target, ticks),
+        "recomputes": room.flow_field.recomputes,
+    }
+
+    # The same room and enemies again, chasing in a straight line
+    random.seed(seed)
+    rng.reseed(seed)
+    random_obstacles(width, height)
+    target.rect.center = (width // 2, height // 2)
+    room = build_room(width, height, enemy_count, [])
+    result["tick_straight_ms"] = time_ticks(room, target, ticks)
+
+    if enemy_count <= NAIVE_MAX_ENEMIES:
+        room.set_obstacles(obstacles)
+        result["naive_per_enemy_ms"] = time_naive(room, target)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flow field pathfinding benchmark")
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=BENCH_OUTPUT)
+    args = parser.parse_args()
+
+    pygame.init()
+    # Enemy sprites are converted on load, which needs a display
+    pygame.display.set_mode((1, 1))
+    results = {"ticks": args.ticks, "seed": args.seed, "cases": []}
+    for width, height in ROOM_SIZES:
+        for enemy_count in ENEMY_COUNTS:
+            case = run_case(width, height, enemy_count, args.ticks, args.seed)
+            case.update({"room": [width, height], "enemies": enemy_count})
+            results["cases"].append(case)
+            naive = case.get("naive_per_enemy_ms")
+            print(
+                f"{width}x{height}, {enemy_count} enemies: "
+                f"recompute {case['recompute_ms']:.2f} ms, "
+                f"tick {case['tick_flow_ms']:.2f} ms "
+                f"(straight {case['tick_straight_ms']:.2f} ms)"
+                + (f", per-enemy search {naive:.1f} ms" if naive is not None else "")
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {args.output}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
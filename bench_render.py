@@ -0,0 +1,307 @@
+# bench_render.py
+"""
+Headless render benchmark.
+
+Runs the game with SDL's dummy video driver, drives each scenario for a
+fixed number of frames with scripted input and reports how long the
+event, update, draw, scale and flip phases of every frame took, as JSON,
+along with the hit counters of the render caches.
+The same seed always produces the same dungeon and the same fights, so
+runs before and after a rendering change can be compared directly.
+
+Usage:
+    python bench_render.py [--frames 300] [--seed 1] [--output bench_render.json]
+                           [--scenarios town exploring map combat char_sheet shop]
+"""
+
+import os
+
+# Must be set before pygame opens a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import copy
+import json
+import statistics
+import time
+import pygame
+import constants as C
+from assets import sprite_cache
+from factories import (
+    GENE_TEMPLATES,
+    ITEM_TEMPLATES,
+    create_enemy,
+    get_available_enemy_types,
+)
+from fonts import font_registry
+from gamemap import GameMap
+from gene import StatGene
+from hero import Hero
+from main import Game
+from rng import rng
+from states import create_state
+from text_cache import text_cache
+from text_layout import text_layout_cache
+
+# "present" is what the main thread waits for; with a pipelined presenter
+# the scale and flip happen on a worker and mostly overlap the next frame
+PHASES = ["events", "update", "draw", "present", "scale", "flip"]
+BENCH_OUTPUT = "bench_render.json"
+LARGE_DUNGEON_ROOMS = 1000
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed() so movement can be scripted."""
+
+    def __init__(self):
+        self.held = set()
+
+    def __call__(self):
+        return self
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0, scancode=0)
+
+
+def make_player():
+    """Builds the same mid-game hero for every run."""
+    player = Hero(
+        first_name="Bench",
+        family_name="Mark",
+        pos_x=100,
+        pos_y=C.INTERNAL_HEIGHT / 2,
+    )
+    player.genome = {}
+    for gene_id, gene in GENE_TEMPLATES.items():
+        if isinstance(gene, StatGene):
+            new_gene = copy.deepcopy(gene)
+            new_gene.value = 5
+            player.genome[gene_id] = new_gene
+    player.equipped_weapon = ITEM_TEMPLATES["broadsword"]
+    player.inventory = [ITEM_TEMPLATES["healing_potion"], ITEM_TEMPLATES["iron_staff"]]
+    player.gold = 500
+    return player
+
+
+def enter_dungeon(game, min_rooms=C.MIN_ROOMS, max_rooms=C.MAX_ROOMS):
+    game.context.game_map = GameMap(
+        min_rooms=min_rooms,
+        max_rooms=max_rooms,
+        screen_width=C.INTERNAL_WIDTH,
+        screen_height=C.INTERNAL_HEIGHT,
+        entry_direction="WEST",
+    )
+    game.context.entry_direction = "WEST"
+    game.state_stack = [create_state("EXPLORING", game)]
+
+
+def walk_in_circles(frame, keys):
+    # A quarter turn every 20 frames keeps the player inside the room
+    keys.held = {[pygame.K_d, pygame.K_s, pygame.K_a, pygame.K_w][frame // 20 % 4]}
+    return []
+
+
+# --- Scenarios: each sets up the state stack and returns a per-frame input script ---
+
+
+def setup_town(game):
+    game.state_stack = [create_state("TOWN", game)]
+    return walk_in_circles
+
+
+def setup_exploring(game):
+    enter_dungeon(game)
+    return walk_in_circles
+
+
+def setup_exploring_large(game):
+    # Background rooms should cost the same per tick however many there are
+    enter_dungeon(game, min_rooms=LARGE_DUNGEON_ROOMS, max_rooms=LARGE_DUNGEON_ROOMS)
+    return walk_in_circles
+
+
+def setup_map(game):
+    enter_dungeon(game)
+    # Reveal the whole dungeon so the overlay has something to draw
+    game.context.game_map.explored_rooms.update(game.context.game_map.rooms)
+    return lambda frame, keys: [key_event(pygame.K_m)] if frame == 0 else []
+
+
+def setup_combat(game):
+    enter_dungeon(game)
+    enemy = create_enemy(sorted(get_available_enemy_types())[0], 0, 0)
+    # Keep the fight going for the whole run
+    enemy.health = enemy.max_health = 10**9
+    game.context.active_enemy = enemy
+    game.state_stack.append(create_state("COMBAT", game))
+
+    def script(frame, keys):
+        game.context.player.health = game.context.player.max_health
+        return [key_event(pygame.K_1)] if frame % 30 == 0 else []
+
+    return script
+
+
+def setup_char_sheet(game):
+    enter_dungeon(game)
+    game.push_state("CHAR_SHEET")
+    # Move the selection up and down the inventory
+    return lambda frame, keys: (
+        [key_event(pygame.K_DOWN if frame // 10 % 2 else pygame.K_UP)]
+        if frame % 10 == 0
+        else []
+    )
+
+
+def setup_shop(game):
+    game.state_stack = [create_state("TOWN", game)]
+    vendor = next(
+        npc for npc in game.get_active_state().town_room.npcs if npc.vendor_id
+    )
+    game.push_state("SHOP", vendor=vendor)
+    # Wiggle the mouse over the panel so hover handling is exercised
+    return lambda frame, keys: [
+        pygame.event.Event(
+            pygame.MOUSEMOTION,
+            pos=(200 + frame % 200, 200),
+            rel=(1, 0),
+            buttons=(0, 0, 0),
+        )
+    ]
+
+
+SCENARIOS = {
+    "town": setup_town,
+    "exploring": setup_exploring,
+    "exploring_large": setup_exploring_large,
+    "map": setup_map,
+    "combat": setup_combat,
+    "char_sheet": setup_char_sheet,
+    "shop": setup_shop,
+}
+
+
+def summarize(samples):
+    """Returns mean/median/p95/max in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def run_scenario(game, name, frames, seed):
+    """Drives one scenario for a number of frames and times each phase."""
+    rng.reseed(seed)
+    game.context.player = make_player()
+    game.context.game_map = None
+    game.running = True
+    script = SCENARIOS[name](game)
+
+    keys = ScriptedKeys()
+    real_get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = keys
+    timings = {phase: [] for phase in PHASES}
+    frames_skipped = game.presenter.frames_skipped
+    states_seen = {}
+    background_times = []
+    game.scheduler.reset_stats()
+    try:
+        for frame in range(frames):
+            start = time.perf_counter()
+            events = script(frame, keys)
+            pygame.event.pump()
+            game.process_events(events)
+            handled = time.perf_counter()
+            # One fixed tick per frame keeps the simulation repeatable
+            game.update(game.tick_dt)
+            updated = time.perf_counter()
+            dirty_rects = game.draw()
+            drawn = time.perf_counter()
+            game.present(dirty_rects)
+            presented = time.perf_counter()
+
+            timings["events"].append(handled - start)
+            timings["update"].append(updated - handled)
+            timings["draw"].append(drawn - updated)
+            timings["present"].append(presented - drawn)
+            timings["scale"].append(game.presenter.last_scale_time)
+            timings["flip"].append(game.presenter.last_flip_time)
+            if game.context.game_map:
+                background_times.append(
+                    game.context.game_map.background_stats["time_ms"] / 1000
+                )
+            state_name = type(game.get_active_state()).__name__
+            states_seen[state_name] = states_seen.get(state_name, 0) + 1
+    finally:
+        pygame.key.get_pressed = real_get_pressed
+
+    # Scale and flip are part of present (or overlap the next frame), so leave them out
+    main_thread = [timings[phase] for phase in ("events", "update", "draw", "present")]
+    totals = [sum(phase_times) for phase_times in zip(*main_thread)]
+    result = {
+        "frames": frames,
+        "frames_skipped": game.presenter.frames_skipped - frames_skipped,
+        "states": states_seen,
+        "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+        "total": summarize(totals),
+    }
+    if background_times:
+        # Part of update: stepping the rooms the player isn't in
+        result["background"] = summarize(background_times)
+        result["rooms"] = len(game.context.game_map.rooms)
+    if game.scheduler.stats():
+        # How often each system ran out of budget and pushed work to the next tick
+        result["scheduler"] = game.scheduler.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless render benchmark")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", default=BENCH_OUTPUT)
+    args = parser.parse_args()
+
+    game = Game()
+    results = {
+        "video_driver": pygame.display.get_driver(),
+        "display_size": list(game.display_screen.get_size()),
+        "presenter_mode": game.presenter.mode,
+        "dirty_rects": game.dirty_rendering,
+        "pipelined_present": game.pipelined_present,
+        "frames": args.frames,
+        "seed": args.seed,
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        results["scenarios"][name] = run_scenario(game, name, args.frames, args.seed)
+        print(f"{name}: {results['scenarios'][name]['total']['mean_ms']:.2f} ms/frame")
+    # Counters for the whole run, including what Game() loaded up front
+    results["caches"] = {
+        "sprites": sprite_cache.stats(),
+        "fonts": font_registry.stats(),
+        "text": text_cache.stats(),
+        "text_layout": text_layout_cache.stats(),
+    }
+
+    # The game prints while it runs, so the report goes to a file, not stdout
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {args.output}")
+    game.presenter.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
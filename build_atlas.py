@@ -0,0 +1,117 @@
+# build_atlas.py
+"""
+Offline build step that packs every sprite in assets/ into one texture atlas.
+
+Each PNG is scaled to its in-game size (C.SPRITE_SIZE), packed into a single
+sheet with a shelf bin-packer and written out together with a JSON manifest
+that maps each original file path to its rectangle on the sheet.
+
+Usage:
+    python build_atlas.py
+"""
+
+import json
+import os
+import pygame
+import constants as C
+
+ASSET_DIR = "assets"
+ATLAS_IMAGE = os.path.join(ASSET_DIR, "atlas.png").replace(os.sep, "/")
+ATLAS_MANIFEST = os.path.join(ASSET_DIR, "atlas.json").replace(os.sep, "/")
+# Transparent gap between sprites so scaled blits never bleed into a neighbour
+ATLAS_PADDING = 1
+
+
+def find_sprite_files(asset_dir=ASSET_DIR):
+    """Returns the sorted list of sprite PNGs, skipping a previously built atlas."""
+    paths = []
+    for filename in sorted(os.listdir(asset_dir)):
+        path = f"{asset_dir}/{filename}"
+        if filename.lower().endswith(".png") and path != ATLAS_IMAGE:
+            paths.append(path)
+    return paths
+
+
+def _next_power_of_two(value):
+    power = 1
+    while power < value:
+        power *= 2
+    return power
+
+
+def pack_rects(sizes, padding=ATLAS_PADDING):
+    """
+    Packs (width, height) boxes into rows ("shelves"), tallest first.
+
+    Args:
+        sizes (dict): Maps a key to a (width, height) tuple.
+        padding (int): Empty pixels left around every box.
+
+    Returns:
+        tuple: The (width, height) of the sheet and a dict mapping each key
+        to its (x, y, width, height) rectangle.
+    """
+    total_area = sum((w + padding) * (h + padding) for w, h in sizes.values())
+    widest = max((w + padding * 2 for w, h in sizes.values()), default=1)
+    sheet_width = _next_power_of_two(max(widest, int(total_area**0.5) + 1))
+
+    placements = {}
+    x = y = padding
+    shelf_height = 0
+    for key in sorted(sizes, key=lambda k: (-sizes[k][1], k)):
+        width, height = sizes[key]
+        if x + width + padding > sheet_width:
+            # Start a new shelf below the tallest box of the current one
+            x = padding
+            y += shelf_height + padding
+            shelf_height = 0
+        placements[key] = (x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+
+    sheet_height = y + shelf_height + padding
+    return (sheet_width, sheet_height), placements
+
+
+def build_atlas(paths, sprite_size=C.SPRITE_SIZE):
+    """Scales and packs the sprite files, returning the sheet and its manifest."""
+    images = {
+        path: pygame.transform.scale(pygame.image.load(path), sprite_size)
+        for path in paths
+    }
+    sheet_size, placements = pack_rects(
+        {path: image.get_size() for path, image in images.items()}
+    )
+
+    sheet = pygame.Surface(sheet_size, pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for path, rect in placements.items():
+        sheet.blit(images[path], rect[:2])
+
+    manifest = {
+        "image": ATLAS_IMAGE,
+        "size": list(sheet_size),
+        "sprites": {
+            path: {"rect": list(rect), "size": list(sprite_size)}
+            for path, rect in placements.items()
+        },
+    }
+    return sheet, manifest
+
+
+def main():
+    pygame.init()
+    paths = find_sprite_files()
+    sheet, manifest = build_atlas(paths)
+    pygame.image.save(sheet, ATLAS_IMAGE)
+    with open(ATLAS_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=4)
+    print(
+        f"Packed {len(paths)} sprites into {ATLAS_IMAGE} "
+        f"({manifest['size'][0]}x{manifest['size'][1]})"
+    )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,133 @@
 # combat.py
-import random
+from dataclasses import dataclass
+from factories import get_attack_type
+from rng import get_rng
+
+BASE_HIT_CHANCE = 90  # Percent, before dexterity and attack modifiers
+DEFEND_REDUCTION = 0.5  # Share of damage blocked when defending
+LOW_HEALTH_FRACTION = 0.3  # Brave kicks in below this share of max health
+
+
+@dataclass(frozen=True)
+class CombatProfile:
+    """
+    Everything about an entity that attack resolution needs, worked out once.
+
+    BaseEntity.combat_profile builds it from the genome and the equipped
+    weapon the first time it is needed and keeps it until either of them
+    changes, so resolving an attack is a few integer operations instead of
+    genome and trait lookups. The fields are plain arithmetic on the stats,
+    so from_stats() also works on NumPy arrays (see combat_sim).
+    """
+
+    accuracy: int  # Added to the attacker's hit chance
+    evasion: int  # Taken off the hit chance of attacks against this entity
+    min_damage: int
+    max_damage: int
+    strength_bonus: int
+    crit_threshold: float  # A d100 roll at or below this is a critical hit
+    crit_multiplier: float
+    brave_boost: float  # Extra damage share at low health, 0 without the trait
+    defend_reduction: float  # Share of damage blocked when defending
+
+    @classmethod
+    def from_stats(cls, stats, weapon, brave_boost=0.0, cautious_bonus=0.0):
+        """Builds a profile from stat values keyed by gene id ("strength", ...)."""
+        dexterity = stats.get("dexterity", 0)
+        if weapon is not None:
+            min_damage, max_damage = weapon.base_damage
+            crit_chance, crit_multiplier = weapon.crit_chance, weapon.crit_multiplier
+        else:
+            min_damage, max_damage, crit_chance, crit_multiplier = 0, 0, 0.0, 1.0
+        return cls(
+            accuracy=dexterity * 2,
+            evasion=dexterity,
+            min_damage=min_damage,
+            max_damage=max_damage,
+            strength_bonus=stats.get("strength", 0) // 2,
+            crit_threshold=crit_chance * 100 + stats.get("luck", 0),
+            crit_multiplier=crit_multiplier,
+            brave_boost=brave_boost,
+            defend_reduction=DEFEND_REDUCTION + cautious_bonus,
+        )
+
+    @classmethod
+    def from_entity(cls, entity):
+        """Compiles the profile of an entity's current genome and weapon."""
+        stats = {gene_id: entity.get_stat(gene_id) for gene_id in entity.genome}
+        brave_boost = 0.0
+        if entity.has_trait("brave"):
+            brave_boost = entity.genome["brave"].effects["low_health_damage_boost"]
+        cautious_bonus = 0.0
+        if entity.has_trait("cautious"):
+            cautious_bonus = entity.genome["cautious"].effects[
+                "defend_damage_reduction"
+            ]
+        return cls.from_stats(
+            stats, entity.equipped_weapon, brave_boost, cautious_bonus
+        )
 
 
 def resolve_attack(attacker, defender, attack_type="normal"):
     """
-    Calculates the outcome of a single attack, now with different attack types.
-    Returns a dictionary with the results.
+    Calculates the outcome of a single attack of any type in attacks.json,
+    given by key ("power") or id. Returns a dictionary with the results.
     """
-    hit_modifier = 0
-    damage_modifier = 1.0
-    message_prefix = ""
-
-    # Apply modifiers based on the attack type
-    if attack_type == "power":
-        hit_modifier = -20  # Power attacks are 20% less likely to hit
-        damage_modifier = 1.5  # Power attacks deal 150% damage
-        message_prefix = "A powerful blow! "
-    # --- Logic for the enemy's special attack ---
-    elif attack_type == "vicious_bite":
-        hit_modifier = -40  # Less accurate than a normal hit
-        damage_modifier = 2.5  # But deals massive damage
-        message_prefix = "Vicious Bite! "
+    attack = get_attack_type(attack_type)
+    attacker_profile = attacker.combat_profile
+    combat_rng = get_rng("combat")
 
     # 1. Calculate Hit Chance
     hit_chance = (
-        90
-        + (attacker.get_stat("Dexterity") * 2)
-        - (defender.get_stat("Dexterity"))
-        + hit_modifier
+        BASE_HIT_CHANCE
+        + attacker_profile.accuracy
+        - defender.combat_profile.evasion
+        + attack.hit_modifier
     )
-    if random.randint(1, 100) > hit_chance:
+    if combat_rng.randint(1, 100) > hit_chance:
         return {
             "type": "miss",
             "damage": 0,
-            "message": f"{attacker.name} missed!",
+            "message": attack.miss_message.format(attacker=attacker.name),
         }
 
     # 2. Calculate Base Damage
-    min_dmg, max_dmg = attacker.equipped_weapon.base_damage
-    base_damage = random.randint(min_dmg, max_dmg)
+    base_damage = combat_rng.randint(
+        attacker_profile.min_damage, attacker_profile.max_damage
+    )
 
     # 3. Add Strength Bonus
-    strength_bonus = attacker.get_stat("Strength") // 2
-    total_damage = base_damage + strength_bonus
+    total_damage = base_damage + attacker_profile.strength_bonus
 
     # --- Check for "Brave" trait effect ---
-    if attacker.has_trait("brave") and attacker.health < (attacker.max_health * 0.3):
-        brave_bonus = attacker.genome["brave"].effects["low_health_damage_boost"]
-        total_damage = int(total_damage * (1 + brave_bonus))
-        message_prefix += "Bravely! "
-
-    # Apply the damage modifier for power attacks
-    total_damage = int(total_damage * damage_modifier)
-
-    # 4. Calculate Critical Hit (Power attacks can't also be crits for now, to keep it simple)
-    if attack_type == "normal":
-        crit_roll_chance = (
-            attacker.equipped_weapon.crit_chance * 100 + attacker.get_stat("luck")
-        )
-        if random.randint(1, 100) <= crit_roll_chance:
-            total_damage = int(total_damage * attacker.equipped_weapon.crit_multiplier)
+    brave = ""
+    if (
+        attacker_profile.brave_boost
+        and attacker.health < attacker.max_health * LOW_HEALTH_FRACTION
+    ):
+        total_damage = int(total_damage * (1 + attacker_profile.brave_boost))
+        brave = "Bravely! "
+
+    # Apply the attack type's damage modifier (e.g. power attacks)
+    total_damage = int(total_damage * attack.damage_modifier)
+
+    # 4. Calculate Critical Hit (only attack types that allow it)
+    if attack.can_crit:
+        if combat_rng.randint(1, 100) <= attacker_profile.crit_threshold:
+            total_damage = int(total_damage * attacker_profile.crit_multiplier)
             return {
                 "type": "crit",
                 "damage": total_damage,
-                "message": f"Critical Hit! {attacker.name} deals {total_damage} damage!",
+                "message": attack.crit_message.format(
+                    attacker=attacker.name, damage=total_damage, brave=brave
+                ),
             }
 
     # 5. Return a normal (or power) hit
     return {
         "type": "hit",
         "damage": total_damage,
-        "message": f"{message_prefix}{attacker.name} deals {total_damage} damage!",
+        "message": attack.hit_message.format(
+            attacker=attacker.name, damage=total_damage, brave=brave
+        ),
     }
@@ -0,0 +1,314 @@
+# combat_sim.py
+"""
+Headless Monte Carlo combat simulator.
+
+Plays out large numbers of player-versus-enemy duels at once in NumPy
+arrays, with the same rules as combat.resolve_attack and CombatState:
+hit chance, strength bonus, the brave trait, the attack types in
+attacks.json, crits, the enemy's vicious bite (a growl, then the bite on
+the next action), defending and the cautious trait. For every weapon in items.json against
+every enemy in enemies.json it reports the win rate, how many turns a kill
+takes and how hard the player's hits land.
+
+Enemies are rolled from their template for every duel (health, stats),
+the player is a fixed build set on the command line. Both sides get their
+numbers from combat.CombatProfile, the same as in the game.
+
+Usage:
+    python combat_sim.py [--duels 1000000] [--seed 1] [--stat 5]
+                         [--traits brave cautious] [--attack normal]
+                         [--defend-chance 0.0]
+                         [--output combat_sim.json]
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+import constants as C
+from combat import BASE_HIT_CHANCE, LOW_HEALTH_FRACTION, CombatProfile
+from factories import (
+    ATTACK_IDS,
+    ENEMY_TEMPLATES,
+    GENE_TEMPLATES,
+    ITEM_TEMPLATES,
+    get_attack_type,
+)
+from item import Weapon
+
+ENEMY_NORMAL_ATTACK_CHANCE = 90  # Percent; otherwise the enemy starts a vicious bite
+
+MAX_TURNS = 200  # Duels still going after this many rounds count as unresolved
+CHUNK_SIZE = 250_000  # Duels simulated together, to bound memory use
+SIM_OUTPUT = "combat_sim.json"
+
+WIN = 1
+LOSS = 2
+
+
+def player_side(weapon, stat_value, traits, count):
+    """The player's build, broadcast across count duels."""
+    stats = {
+        stat_id: np.full(count, stat_value)
+        for stat_id in ("strength", "dexterity", "luck")
+    }
+    brave_boost = 0.0
+    if "brave" in traits:
+        brave_boost = GENE_TEMPLATES["brave"].effects["low_health_damage_boost"]
+    cautious_bonus = 0.0
+    if "cautious" in traits:
+        cautious_bonus = GENE_TEMPLATES["cautious"].effects["defend_damage_reduction"]
+    return {
+        "health": np.full(count, C.PLAYER_STARTING_HEALTH),
+        "max_health": np.full(count, C.PLAYER_STARTING_HEALTH),
+        "profile": CombatProfile.from_stats(stats, weapon, brave_boost, cautious_bonus),
+    }
+
+
+def enemy_side(generator, template, count):
+    """count enemies rolled from a template, as Enemy.__init__ does."""
+    health = generator.integers(
+        template["health_range"][0], template["health_range"][1] + 1, count
+    )
+    # Enemy genomes are keyed by the lowercased stat name
+    stats = {
+        stat_id.lower(): generator.integers(low, high + 1, count)
+        for stat_id, (low, high) in template.get("stats", {}).items()
+    }
+    for stat_id in ("strength", "dexterity", "luck"):
+        stats.setdefault(stat_id, np.zeros(count, dtype=int))
+    return {
+        "health": health,
+        "max_health": health.copy(),
+        "profile": CombatProfile.from_stats(stats, ITEM_TEMPLATES[template["weapon"]]),
+    }
+
+
+def resolve_attacks(generator, attacker, defender, attack_type, duels):
+    """
+    resolve_attack for the duels indexed by duels, all at once.
+    Returns the damage of each attack (0 for a miss) and which ones hit.
+    The stat-based profile fields are arrays with one entry per duel.
+    """
+    attack = get_attack_type(attack_type)
+    profile = attacker["profile"]
+    count = len(duels)
+    hit_chance = (
+        BASE_HIT_CHANCE
+        + profile.accuracy[duels]
+        - defender["profile"].evasion[duels]
+        + attack.hit_modifier
+    )
+    hit = generator.integers(1, 101, count) <= hit_chance
+
+    damage = generator.integers(profile.min_damage, profile.max_damage + 1, count)
+    damage += profile.strength_bonus[duels]
+    if profile.brave_boost:
+        low_health = (
+            attacker["health"][duels]
+            < attacker["max_health"][duels] * LOW_HEALTH_FRACTION
+        )
+        damage = np.where(
+            low_health, (damage * (1 + profile.brave_boost)).astype(int), damage
+        )
+    damage = (damage * attack.damage_modifier).astype(int)
+
+    if attack.can_crit:
+        crit = generator.integers(1, 101, count) <= profile.crit_threshold[duels]
+        damage = np.where(crit, (damage * profile.crit_multiplier).astype(int), damage)
+    return np.where(hit, damage, 0), hit
+
+
+def simulate_chunk(
+    generator, weapon, template, count, stat_value, traits, attack_type, defend_chance
+):
+    """Plays count duels to the end. Returns outcomes, rounds and the player's hits."""
+    player = player_side(weapon, stat_value, traits, count)
+    enemy = enemy_side(generator, template, count)
+    outcome = np.zeros(count, dtype=np.int8)
+    rounds = np.zeros(count, dtype=int)
+    defending = np.zeros(count, dtype=bool)
+    charging = np.zeros(count, dtype=bool)
+    hit_counts = np.zeros(1, dtype=np.int64)  # Landed player hits, by damage
+    attacks = 0
+    reduction = player["profile"].defend_reduction
+
+    for _ in range(MAX_TURNS):
+        active = np.flatnonzero(outcome == 0)
+        if not len(active):
+            break
+        rounds[active] += 1
+
+        # --- Player's turn ---
+        defend = generator.random(len(active)) < defend_chance
+        defending[active[defend]] = True
+        attackers = active[~defend]
+        damage, hit = resolve_attacks(generator, player, enemy, attack_type, attackers)
+        attacks += len(attackers)
+        hit_counts = add_counts(hit_counts, np.bincount(damage[hit]))
+        enemy["health"][attackers] = np.maximum(0, enemy["health"][attackers] - damage)
+        outcome[attackers[enemy["health"][attackers] <= 0]] = WIN
+
+        # --- Enemy's turn: a growl keeps the turn, so the bite follows at once ---
+        acting = active[outcome[active] == 0]
+        while len(acting):
+            was_charging = charging[acting]
+            normal = np.zeros(len(acting), dtype=bool)
+            normal[~was_charging] = (
+                generator.integers(1, 101, int((~was_charging).sum()))
+                <= ENEMY_NORMAL_ATTACK_CHANCE
+            )
+            growling = ~was_charging & ~normal
+
+            damage_taken = np.zeros(len(acting), dtype=int)
+            damage_taken[was_charging] = resolve_attacks(
+                generator, enemy, player, "vicious_bite", acting[was_charging]
+            )[0]
+            damage_taken[normal] = resolve_attacks(
+                generator, enemy, player, "normal", acting[normal]
+            )[0]
+            charging[acting] = growling
+
+            # Defending softens the enemy's next action, even a growl
+            blocked = defending[acting]
+            damage_taken[blocked] = (damage_taken[blocked] * (1 - reduction)).astype(
+                int
+            )
+            defending[acting] = False
+
+            player["health"][acting] = np.maximum(
+                0, player["health"][acting] - damage_taken
+            )
+            outcome[acting[player["health"][acting] <= 0]] = LOSS
+            acting = acting[growling & (outcome[acting] == 0)]
+
+    return outcome, rounds, hit_counts, attacks
+
+
+def add_counts(total, counts):
+    """Adds two histograms (np.bincount results) of possibly different lengths."""
+    if len(counts) > len(total):
+        total, counts = counts.astype(np.int64), total
+    total[: len(counts)] += counts
+    return total
+
+
+def percentiles(counts, points=(10, 50, 90, 99)):
+    """Percentiles of small whole numbers from their histogram, cheaper than sorting."""
+    total = counts.sum()
+    if not total:
+        return None
+    cumulative = np.cumsum(counts)
+    return {
+        f"p{point}": int(np.searchsorted(cumulative, total * point / 100))
+        for point in points
+    }
+
+
+def simulate(
+    weapon,
+    enemy_id,
+    duels,
+    seed,
+    stat_value=5,
+    traits=(),
+    attack_type="normal",
+    defend_chance=0.0,
+):
+    """Simulates duels of a player with weapon against enemy_id and summarizes them."""
+    generator = np.random.default_rng(seed)
+    template = ENEMY_TEMPLATES[enemy_id]
+    outcomes, rounds = [], []
+    hit_counts = np.zeros(1, dtype=np.int64)
+    attacks = 0
+    for start in range(0, duels, CHUNK_SIZE):
+        count = min(CHUNK_SIZE, duels - start)
+        outcome, chunk_rounds, chunk_hit_counts, chunk_attacks = simulate_chunk(
+            generator,
+            weapon,
+            template,
+            count,
+            stat_value,
+            traits,
+            attack_type,
+            defend_chance,
+        )
+        outcomes.append(outcome)
+        rounds.append(chunk_rounds)
+        hit_counts = add_counts(hit_counts, chunk_hit_counts)
+        attacks += chunk_attacks
+    outcome = np.concatenate(outcomes)
+    rounds = np.concatenate(rounds)
+    won = outcome == WIN
+    return {
+        "duels": duels,
+        "win_rate": float(won.mean()),
+        "loss_rate": float((outcome == LOSS).mean()),
+        "unresolved_rate": float((outcome == 0).mean()),
+        "turns_to_kill": percentiles(np.bincount(rounds[won])),
+        "mean_turns_to_kill": float(rounds[won].mean()) if won.any() else None,
+        "hit_rate": int(hit_counts.sum()) / attacks if attacks else 0.0,
+        "hit_damage": percentiles(hit_counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo combat simulator")
+    parser.add_argument("--duels", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--stat", type=int, default=5, help="the player's strength, dexterity and luck"
+    )
+    parser.add_argument(
+        "--traits", nargs="*", default=[], choices=["brave", "cautious"]
+    )
+    parser.add_argument("--attack", choices=list(ATTACK_IDS), default="normal")
+    parser.add_argument(
+        "--defend-chance",
+        type=float,
+        default=0.0,
+        help="how often the player defends instead of attacking",
+    )
+    parser.add_argument("--output", default=SIM_OUTPUT)
+    args = parser.parse_args()
+
+    weapons = [item for item in ITEM_TEMPLATES.values() if isinstance(item, Weapon)]
+    results = {
+        "duels": args.duels,
+        "seed": args.seed,
+        "stat": args.stat,
+        "traits": args.traits,
+        "attack": args.attack,
+        "defend_chance": args.defend_chance,
+        "matchups": {},
+    }
+    start = time.perf_counter()
+    for weapon in weapons:
+        for enemy_id in ENEMY_TEMPLATES:
+            summary = simulate(
+                weapon,
+                enemy_id,
+                args.duels,
+                args.seed,
+                args.stat,
+                args.traits,
+                args.attack,
+                args.defend_chance,
+            )
+            results["matchups"][f"{weapon.item_id} vs {enemy_id}"] = summary
+            turns = summary["turns_to_kill"] or {}
+            print(
+                f"{weapon.name:>14} vs {enemy_id:<8} "
+                f"win {summary['win_rate']:6.1%}  "
+                f"turns p50 {turns.get('p50', 0):4.0f} p90 {turns.get('p90', 0):4.0f}  "
+                f"hit {summary['hit_rate']:5.1%}"
+            )
+    print(f"Simulated in {time.perf_counter() - start:.1f} s")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,23 @@ INTERNAL_HEIGHT = 600
 DEFAULT_SCREEN_WIDTH = 800
 DEFAULT_SCREEN_HEIGHT = 600
 FPS = 60
+# Default "tick_rate" setting: simulation updates per second, independent of FPS
+SIM_TICK_RATE = 60
+# Tick rates the setting may ask for; anything else falls back to SIM_TICK_RATE
+MIN_TICK_RATE = 10
+MAX_TICK_RATE = 240
+# Movement speeds and AI timers are tuned per tick at this rate and scaled by dt
+BASE_TICK_RATE = 60
+# Most simulation ticks run in one frame before the backlog is dropped
+MAX_CATCH_UP_TICKS = 5
+# Default for the "dirty_rects" setting: only present the regions that changed
+DIRTY_RECT_RENDERING = False
+# Default "scale_filter" setting for non-integer window sizes: "nearest" or "smooth"
+SCALE_FILTER = "nearest"
+# Default "pipelined_present" setting: scale and flip on a worker thread
+PIPELINED_PRESENT = False
+# Default "seed" setting for the random streams: None picks a new seed per game
+RNG_SEED = None
 
 # --- COLORS ---
 WHITE = (255, 255, 255)
@@ -26,6 +43,10 @@ ROOM_COLOR = (50, 50, 50)
 FONT_SIZE_TEXT = 28
 FONT_SIZE_HEADER = 36
 FONT_SIZE_TITLE = 48
+# Maximum number of rendered text surfaces kept by the text cache
+TEXT_CACHE_SIZE = 256
+# Maximum number of wrapped text blocks kept by the text layout cache
+TEXT_LAYOUT_CACHE_SIZE = 64
 
 # --- PLAYER ---
 PLAYER_SPEED = 5
@@ -34,6 +55,12 @@ PLAYER_STARTING_HEALTH = 100
 # --- GAMEPLAY ---
 NPC_INTERACTION_RADIUS = 60
 COMBAT_ENEMY_TURN_DELAY = 500  # milliseconds
+# Messages kept by the combat log, and how many of them are on screen
+COMBAT_LOG_CAPACITY = 100
+COMBAT_LOG_VISIBLE_LINES = 4
+# Rooms with at least this many enemies run their AI as one NumPy batch.
+# Below that, the per-enemy path is faster than the array setup.
+AI_BATCH_MIN_ENEMIES = 48
 
 # --- UI LAYOUT ---
 # Character Creation
@@ -63,5 +90,38 @@ MAP_ROOM_MARGIN = 10
 MIN_ROOMS = 5
 MAX_ROOMS = 30
 
+# Cell size of each room's spatial hash, about two sprites across
+SPATIAL_CELL_SIZE = 64
+# Cell size of a room's flow field: one sprite-sized step of the shared path
+FLOW_CELL_SIZE = 32
+
+# --- BACKGROUND ROOMS ---
+# Rooms next to the player's room are stepped this often (seconds)
+LOD_NEAR_INTERVAL = 0.1
+# Distant rooms visited per tick, in turn, each paid all the time it missed
+LOD_FAR_ROOMS_PER_TICK = 2
+# Longest single step a background room takes (seconds); longer debts are
+# paid back in several steps
+LOD_MAX_STEP = 2.0
+# Most background room steps per tick. Counted rather than timed, so seeded
+# runs are capped the same way on every machine. At 60 ticks a second this
+# keeps up with about 1400 rooms; bigger dungeons fall behind instead of
+# slowing the game down.
+BACKGROUND_TICK_MAX_STEPS = 12
+# Most time spent on background rooms per tick (milliseconds)
+BACKGROUND_TICK_BUDGET_MS = 1.0
+
+# --- FRAME SCHEDULER ---
+# Time per tick for scheduled per-entity work like AI (milliseconds)
+SCHEDULER_BUDGET_MS = 4.0
+# Most time a deferred item catches up on in one go (seconds)
+SCHEDULER_MAX_CATCH_UP = 0.25
+# Items per tick instead of milliseconds when the "seed" setting is fixed, so
+# how much AI runs each tick is the same on every machine
+SCHEDULER_BUDGET_ITEMS = 200
+# Scheduler priorities: higher runs first and gets the budget first
+PRIORITY_ROOM_AI = 10
+PRIORITY_BACKGROUND_ROOMS = 0
+
 # --- ENTITY SIZES ---
 SPRITE_SIZE = (64, 64)
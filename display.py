@@ -0,0 +1,229 @@
+# display.py
+import math
+import queue
+import threading
+import time
+import pygame
+import constants as C
+
+# Filters the player can pick for non-integer window sizes
+SCALE_FILTERS = {
+    "nearest": pygame.transform.scale,
+    "smooth": pygame.transform.smoothscale,
+}
+
+
+def merge_rects(rects):
+    """Collapses overlapping rectangles so each screen region is pushed only once."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Keep absorbing overlapping rects until this one stops growing
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Presenter:
+    """
+    Copies the fixed-resolution virtual screen onto the real window.
+
+    present() accepts the dirty rectangles reported by the active state:
+    None means the whole frame changed, an empty list means nothing changed
+    and the frame is skipped, and a list of rects means only those regions
+    are rescaled and pushed with pygame.display.update().
+
+    Scaling writes straight into the display surface, so no per-frame
+    surfaces are allocated. The scaling path is chosen once per window size
+    in resize(): a plain blit when the sizes match, an exact nearest-neighbour
+    scale for integer multiples, and the configured filter otherwise.
+    """
+
+    def __init__(self, display_screen, scale_filter=C.SCALE_FILTER):
+        self.display_screen = display_screen
+        self.virtual_rect = pygame.Rect(0, 0, C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)
+        self.scale_filter = scale_filter
+        self.frames_presented = 0
+        self.frames_skipped = 0
+        # Seconds spent scaling and flipping the last presented frame
+        self.last_scale_time = 0.0
+        self.last_flip_time = 0.0
+        self.resize(display_screen)
+
+    def set_filter(self, scale_filter):
+        """Switches the filter used for non-integer window sizes."""
+        if scale_filter not in SCALE_FILTERS:
+            raise ValueError(f"Unknown scale filter: {scale_filter}")
+        self.scale_filter = scale_filter
+        self.resize(self.display_screen)
+
+    def resize(self, display_screen):
+        """Rebuilds the scaling stage for a new window. Only called on size changes."""
+        self.display_screen = display_screen
+        self.display_size = display_screen.get_size()
+        display_width, display_height = self.display_size
+        self.scale_x = display_width / C.INTERNAL_WIDTH
+        self.scale_y = display_height / C.INTERNAL_HEIGHT
+        # Only used if the display can't be scaled into directly (e.g. 8-bit
+        # modes): 32-bit copies of the source and of the scaled result
+        self._source_surface = None
+        self._scaled_surface = None
+
+        if self.display_size == self.virtual_rect.size:
+            self.mode = "identity"
+        elif self.scale_x.is_integer() and self.scale_y.is_integer():
+            # Whole-number multiples map every pixel exactly, so no filtering is needed
+            self.mode = "integer"
+        else:
+            self.mode = self.scale_filter
+        self._scale = SCALE_FILTERS.get(self.mode, pygame.transform.scale)
+
+    def present(self, virtual_screen, dirty_rects=None):
+        """Scales the virtual screen (or just its dirty regions) to the window."""
+        if dirty_rects is None:
+            self._present_full(virtual_screen)
+        elif not dirty_rects:
+            self.frames_skipped += 1
+            self.last_scale_time = self.last_flip_time = 0.0
+            return
+        else:
+            self._present_rects(virtual_screen, dirty_rects)
+        self.frames_presented += 1
+
+    def _present_full(self, virtual_screen):
+        start = time.perf_counter()
+        if self.mode == "identity":
+            self.display_screen.blit(virtual_screen, (0, 0))
+        else:
+            self._scale_into(virtual_screen, self.display_screen)
+        scaled = time.perf_counter()
+        pygame.display.flip()
+        self._record_times(start, scaled)
+
+    def _record_times(self, start, scaled):
+        self.last_scale_time = scaled - start
+        self.last_flip_time = time.perf_counter() - scaled
+
+    def _present_rects(self, virtual_screen, dirty_rects):
+        start = time.perf_counter()
+        updated = []
+        for rect in merge_rects(dirty_rects):
+            if self.mode in ("identity", "integer"):
+                # Exact pixel mapping, so regions never need padding
+                source_rect = rect.clip(self.virtual_rect)
+            else:
+                # Grow by a pixel so rounding never leaves a seam between regions
+                source_rect = rect.inflate(2, 2).clip(self.virtual_rect)
+            if not source_rect:
+                continue
+            dest_rect = self.to_display_rect(source_rect)
+            source = virtual_screen.subsurface(source_rect)
+            if self.mode == "identity":
+                self.display_screen.blit(source, dest_rect)
+            else:
+                self._scale_into(source, self.display_screen.subsurface(dest_rect))
+            updated.append(dest_rect)
+        scaled = time.perf_counter()
+        if updated:
+            pygame.display.update(updated)
+        self._record_times(start, scaled)
+
+    def wait(self):
+        """Blocks until the last frame is on screen. Presenting here is synchronous."""
+
+    def close(self):
+        """Releases anything the presenter holds. Nothing to do here."""
+
+    def _scale_into(self, source, dest):
+        """Scales source to fill dest without allocating a new surface."""
+        if self._scaled_surface is None:
+            try:
+                self._scale(source, dest.get_size(), dest)
+                return
+            except ValueError:
+                # smoothscale needs 24/32-bit surfaces. From now on, go
+                # through 32-bit surfaces allocated once per window size.
+                self._source_surface = pygame.Surface(self.virtual_rect.size, 0, 32)
+                self._scaled_surface = pygame.Surface(self.display_size, 0, 32)
+        source_copy = self._source_surface.subsurface((0, 0), source.get_size())
+        source_copy.blit(source, (0, 0))
+        scratch = self._scaled_surface.subsurface((0, 0), dest.get_size())
+        self._scale(source_copy, dest.get_size(), scratch)
+        dest.blit(scratch, (0, 0))
+
+    def to_display_rect(self, rect):
+        """Maps a rect in virtual-screen coordinates onto the window."""
+        left = math.floor(rect.left * self.scale_x)
+        top = math.floor(rect.top * self.scale_y)
+        right = math.ceil(rect.right * self.scale_x)
+        bottom = math.ceil(rect.bottom * self.scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top).clip(
+            self.display_screen.get_rect()
+        )
+
+
+class PipelinedPresenter(Presenter):
+    """
+    A Presenter that scales and flips on a worker thread, so presenting
+    frame N overlaps the event handling and updates of frame N+1. pygame
+    releases the GIL inside its transforms, so the two really run side by side.
+
+    present() hands the virtual screen to the worker and returns at once.
+    The caller must not draw into that surface until the next present(),
+    which is why the game double-buffers its virtual screen in this mode.
+    At most one frame is in flight: present() first waits for the previous one.
+
+    SDL only guarantees window updates from the main thread on some
+    platforms (notably macOS), so this mode is opt-in.
+    """
+
+    def __init__(self, display_screen, scale_filter=C.SCALE_FILTER):
+        self._frames = queue.Queue(maxsize=1)
+        self._idle = threading.Event()
+        self._idle.set()
+        self._error = None
+        super().__init__(display_screen, scale_filter)
+        self._worker = threading.Thread(target=self._run, name="presenter", daemon=True)
+        self._worker.start()
+
+    def resize(self, display_screen):
+        # The worker must be done with the old window before it is replaced
+        self.wait()
+        super().resize(display_screen)
+
+    def present(self, virtual_screen, dirty_rects=None):
+        if dirty_rects is not None and not dirty_rects:
+            super().present(virtual_screen, dirty_rects)  # Only counts the skip
+            return
+        self.wait()
+        self._idle.clear()
+        self._frames.put((virtual_screen, dirty_rects))
+
+    def wait(self):
+        self._idle.wait()
+        if self._error:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Presents the frame in flight and stops the worker."""
+        if self._worker.is_alive():
+            self.wait()
+            self._frames.put(None)
+            self._worker.join()
+
+    def _run(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            try:
+                super().present(*frame)
+            except Exception as error:
+                # Raised again on the main thread by the next wait()
+                self._error = error
+            finally:
+                self._idle.set()
@@ -1,11 +1,12 @@
 # enemy.py
 import copy
 import pygame
-import random
 import math
 import constants as C
+from assets import get_sprite
 from entity import BaseEntity
 from factories import GENE_TEMPLATES
+from rng import get_rng
 
 
 class Enemy(BaseEntity):
@@ -20,10 +21,9 @@ class Enemy(BaseEntity):
         sprite_filename = template_data.get("sprite")
 
         # Appearance
-        # --- Load image from file if it exists ---
+        # --- Use the shared sprite from the asset cache if it exists ---
         if sprite_filename:
-            loaded_image = pygame.image.load(sprite_filename).convert_alpha()
-            self.image = pygame.transform.scale(loaded_image, C.SPRITE_SIZE)
+            self.image = get_sprite(sprite_filename, C.SPRITE_SIZE)
         else:
             # Fallback to the colored square
             self.image = pygame.Surface((32, 32))
@@ -31,16 +31,17 @@ class Enemy(BaseEntity):
         self.rect = self.image.get_rect(center=(pos_x, pos_y))
 
         # Stats with random variation
-        self.health = random.randint(*template_data["health_range"])
+        spawn_rng = get_rng("spawn")
+        self.health = spawn_rng.randint(*template_data["health_range"])
         self.max_health = self.health
         # Populate genome from template
         stat_template = template_data.get("stats", {})
         for stat_id, value_range in stat_template.items():
             gene_template = GENE_TEMPLATES[stat_id.lower()]
             new_gene = copy.deepcopy(gene_template)
-            new_gene.value = random.randint(*value_range)
+            new_gene.value = spawn_rng.randint(*value_range)
             self.genome[stat_id.lower()] = new_gene
-        self.speed = random.uniform(*template_data["speed_range"])
+        self.speed = spawn_rng.uniform(*template_data["speed_range"])
         self.sight_radius = template_data["sight_radius"]
         self.chase_radius = self.sight_radius + 50
         self.gold_drop_range = template_data.get("gold_drop_range", [1, 1])
@@ -54,14 +55,22 @@ class Enemy(BaseEntity):
         self.is_charging_attack = False
         self.wander_direction = self.get_random_direction()
         self.wander_timer = 0
-        self.wander_duration = random.randint(60, 180)
+        self.wander_duration = spawn_rng.randint(60, 180) / C.BASE_TICK_RATE  # seconds
 
     def get_random_direction(self):
-        angle = random.uniform(0, 2 * math.pi)
+        angle = get_rng("ai").uniform(0, 2 * math.pi)
         return (math.cos(angle), math.sin(angle))
 
-    def update_ai(self, player, screen_width, screen_height):
-        # ... (This entire method is unchanged) ...
+    def update_ai(
+        self,
+        player,
+        screen_width,
+        screen_height,
+        dt=1 / C.BASE_TICK_RATE,
+        flow_field=None,
+    ):
+        # Speeds are in pixels per tick at the base rate
+        step = self.speed * dt * C.BASE_TICK_RATE
         dist_to_player = math.hypot(
             self.rect.centerx - player.rect.centerx,
             self.rect.centery - player.rect.centery,
@@ -70,25 +79,38 @@ class Enemy(BaseEntity):
             if dist_to_player < self.sight_radius:
                 self.state = "CHASING"
                 return
-            self.wander_timer += 1
-            if self.wander_timer >= self.wander_duration:
-                self.wander_direction = self.get_random_direction()
-                self.wander_timer = 0
-                self.wander_duration = random.randint(60, 180)
-            dx = self.wander_direction[0] * self.speed
-            dy = self.wander_direction[1] * self.speed
-            self.move(dx, dy, screen_width, screen_height)
+            self.wander(screen_width, screen_height, dt)
         elif self.state == "CHASING":
             if dist_to_player > self.chase_radius:
                 self.state = "WANDERING"
                 return
-            dx = player.rect.centerx - self.rect.centerx
-            dy = player.rect.centery - self.rect.centery
-            norm = math.hypot(dx, dy)
-            if norm > 0:
-                dx /= norm
-                dy /= norm
-            self.move(dx * self.speed, dy * self.speed, screen_width, screen_height)
+            # Follow the room's flow field around obstacles when there is one;
+            # it has no direction in the player's own cell, so close in directly
+            direction = None
+            if flow_field is not None:
+                direction = flow_field.direction_at(self.rect.center)
+            if direction is not None:
+                dx, dy = direction
+            else:
+                dx = player.rect.centerx - self.rect.centerx
+                dy = player.rect.centery - self.rect.centery
+                norm = math.hypot(dx, dy)
+                if norm > 0:
+                    dx /= norm
+                    dy /= norm
+            self.move(dx * step, dy * step, screen_width, screen_height)
+
+    def wander(self, screen_width, screen_height, dt):
+        """Walks in the current wander direction, turning when the wander timer runs out."""
+        step = self.speed * dt * C.BASE_TICK_RATE
+        self.wander_timer += dt
+        if self.wander_timer >= self.wander_duration:
+            self.wander_direction = self.get_random_direction()
+            self.wander_timer = 0
+            self.wander_duration = get_rng("ai").randint(60, 180) / C.BASE_TICK_RATE
+        dx = self.wander_direction[0] * step
+        dy = self.wander_direction[1] * step
+        self.move(dx, dy, screen_width, screen_height)
 
     # def move(self, dx, dy, screen_width, screen_height):
     #     self.rect.x += dx
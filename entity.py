@@ -2,6 +2,8 @@
 import pygame
 import constants as C
 import copy
+import math
+from combat import CombatProfile
 from gene import StatGene, TraitGene
 
 
@@ -19,10 +21,50 @@ class BaseEntity(pygame.sprite.Sprite):
 
         self.health = 1
         self.max_health = 1
+        # Compiled from genome and equipped_weapon on demand, see combat_profile
+        self._combat_profile = None
         self.genome = {}
         self.equipped_weapon = None
         self.is_defending = False
 
+        # Fractions of a pixel left over by move(), carried into the next move
+        self._move_remainder = [0.0, 0.0]
+        # Where the rect was when the current tick began, for render interpolation
+        self.previous_topleft = None
+        # The room's SpatialHash this entity is registered with, kept up to date on move
+        self.spatial_index = None
+
+    @property
+    def genome(self):
+        return self._genome
+
+    @genome.setter
+    def genome(self, genome):
+        self._genome = genome
+        self._combat_profile = None
+
+    @property
+    def equipped_weapon(self):
+        return self._equipped_weapon
+
+    @equipped_weapon.setter
+    def equipped_weapon(self, weapon):
+        self._equipped_weapon = weapon
+        self._combat_profile = None
+
+    @property
+    def combat_profile(self):
+        """
+        The entity's CombatProfile, rebuilt after the genome or the weapon is
+        replaced. Changing the genome in place needs invalidate_combat_profile().
+        """
+        if self._combat_profile is None:
+            self._combat_profile = CombatProfile.from_entity(self)
+        return self._combat_profile
+
+    def invalidate_combat_profile(self):
+        self._combat_profile = None
+
     def get_stat(self, stat_id):
         """Safely gets a stat value from the genome."""
         gene = self.genome.get(stat_id)
@@ -42,10 +84,48 @@ class BaseEntity(pygame.sprite.Sprite):
         genes = [g for g in self.genome.values() if isinstance(g, TraitGene)]
         return sorted(genes, key=lambda g: g.name)
 
+    def begin_tick(self):
+        """Remembers where this simulation tick started."""
+        self.previous_topleft = self.rect.topleft
+
+    def reset_interpolation(self):
+        """Stops interpolating from the old position, e.g. after a teleport."""
+        self.previous_topleft = None
+
+    def interpolated_topleft(self, alpha):
+        """Returns where to draw the entity, alpha of the way through the last tick."""
+        if self.previous_topleft is None or alpha >= 1:
+            return self.rect.topleft
+        previous_x, previous_y = self.previous_topleft
+        return (
+            round(previous_x + (self.rect.x - previous_x) * alpha),
+            round(previous_y + (self.rect.y - previous_y) * alpha),
+        )
+
+    def exact_position(self):
+        """Returns the top-left corner including the fractions move() has kept back."""
+        return (
+            self.rect.x + self._move_remainder[0],
+            self.rect.y + self._move_remainder[1],
+        )
+
+    def set_position(self, x, y):
+        """Puts the entity's top-left corner at an exact, possibly fractional, position."""
+        self.rect.x = math.floor(x)
+        self.rect.y = math.floor(y)
+        self._move_remainder = [x - self.rect.x, y - self.rect.y]
+        if self.spatial_index is not None:
+            self.spatial_index.update(self, self.rect)
+
     def move(self, dx, dy, screen_width, screen_height):
         """Moves the entity and keeps it on screen."""
-        self.rect.x += dx
-        self.rect.y += dy
+        # Rects only hold whole pixels, so keep the fractions for the next move
+        dx += self._move_remainder[0]
+        dy += self._move_remainder[1]
+        step_x, step_y = int(dx), int(dy)
+        self._move_remainder = [dx - step_x, dy - step_y]
+        self.rect.x += step_x
+        self.rect.y += step_y
         if self.rect.left < 0:
             self.rect.left = 0
         if self.rect.right > screen_width:
@@ -54,3 +134,12 @@ class BaseEntity(pygame.sprite.Sprite):
             self.rect.top = 0
         if self.rect.bottom > screen_height:
             self.rect.bottom = screen_height
+        if self.spatial_index is not None:
+            self.spatial_index.update(self, self.rect)
+
+    def kill(self):
+        """Removes the entity from every sprite group and its spatial index."""
+        if self.spatial_index is not None:
+            self.spatial_index.remove(self)
+            self.spatial_index = None
+        super().kill()
@@ -1,5 +1,7 @@
 # factories.py
 import json
+import sys
+from attack import AttackType
 from item import Item, Weapon, Consumable
 from gene import Gene, StatGene, TraitGene, CosmeticGene
 
@@ -16,6 +18,9 @@ with open("vendors.json", "r") as f:
 with open("genetics.json", "r") as f:
     GENE_TEMPLATES_DATA = json.load(f)
 
+with open("attacks.json", "r") as f:
+    ATTACK_TEMPLATES_DATA = json.load(f)
+
 # Create a dictionary of Weapon objects, ready to be used
 ITEM_TEMPLATES = {}
 for item_id, item_data in ITEM_TEMPLATES_DATA.items():
@@ -63,6 +68,22 @@ for gene_id, gene_data in GENE_TEMPLATES_DATA.items():
             effects=gene_data["effects"],
         )
 
+# --- Compile the attack types into a table indexed by small integer ids ---
+ATTACK_IDS = {}  # "power" -> 1
+ATTACK_TYPES = []  # attack id -> AttackType
+for attack_id, (attack_key, attack_data) in enumerate(ATTACK_TEMPLATES_DATA.items()):
+    attack_key = sys.intern(attack_key)
+    ATTACK_IDS[attack_key] = attack_id
+    ATTACK_TYPES.append(AttackType(attack_id=attack_id, key=attack_key, **attack_data))
+ATTACK_TYPES = tuple(ATTACK_TYPES)
+
+
+def get_attack_type(attack):
+    """Returns the AttackType for an attack id or key ("normal", "power", ...)."""
+    if isinstance(attack, int):
+        return ATTACK_TYPES[attack]
+    return ATTACK_TYPES[ATTACK_IDS[attack]]
+
 
 def create_enemy(enemy_name, x, y):
     """
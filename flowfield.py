@@ -0,0 +1,153 @@
+# flowfield.py
+import math
+from collections import deque
+import pygame
+import constants as C
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only batched AI reads the array form
+    np = None
+
+# Neighbour offsets: the four sides first, then the diagonals
+SIDE_OFFSETS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIAGONAL_OFFSETS = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+
+class FlowField:
+    """
+    A shared pathfinding grid for every enemy chasing the player in a room.
+
+    The room is divided into cells. A breadth-first search from the
+    player's cell gives every reachable cell its distance to the player,
+    going around blocked cells, and each cell then stores a unit vector
+    towards its closest neighbour. An enemy only has to look up the cell it
+    stands in, so steering costs the same for one enemy or a thousand, and
+    the search is only repeated when the player moves into another cell.
+    """
+
+    def __init__(self, width, height, obstacles=(), cell_size=C.FLOW_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.target_cell = None
+        self.distances = []
+        self.directions = []
+        # Array copies for vectorized lookups (None without NumPy)
+        self.direction_array = None
+        self.has_direction = None
+        self.recomputes = 0
+        self.set_obstacles(obstacles)
+
+    def set_obstacles(self, obstacles):
+        """Marks every cell an obstacle rect touches as blocked."""
+        self.blocked = bytearray(self.cols * self.rows)
+        for obstacle in obstacles:
+            obstacle = pygame.Rect(obstacle)
+            first_x = max(obstacle.left // self.cell_size, 0)
+            first_y = max(obstacle.top // self.cell_size, 0)
+            last_x = min((obstacle.right - 1) // self.cell_size, self.cols - 1)
+            last_y = min((obstacle.bottom - 1) // self.cell_size, self.rows - 1)
+            for cell_y in range(first_y, last_y + 1):
+                for cell_x in range(first_x, last_x + 1):
+                    self.blocked[cell_y * self.cols + cell_x] = 1
+        self._build_neighbors()
+        self.target_cell = None  # Recompute on the next update
+
+    def _build_neighbors(self):
+        """
+        Lists, once per obstacle layout, the open cells each open cell can
+        step to, so the searches don't re-check bounds and walls every time.
+        """
+        cols, rows, blocked = self.cols, self.rows, self.blocked
+        diagonal = 1 / math.sqrt(2)
+        self._sides = [()] * (cols * rows)
+        self._steps = [()] * (cols * rows)
+        for cell_y in range(rows):
+            for cell_x in range(cols):
+                index = cell_y * cols + cell_x
+                if blocked[index]:
+                    continue
+                sides = []
+                steps = []
+                for dx, dy in SIDE_OFFSETS + DIAGONAL_OFFSETS:
+                    next_x, next_y = cell_x + dx, cell_y + dy
+                    if not (0 <= next_x < cols and 0 <= next_y < rows):
+                        continue
+                    next_index = next_y * cols + next_x
+                    if blocked[next_index]:
+                        continue
+                    if dx and dy:
+                        # Don't cut across the corner of a blocked cell
+                        if blocked[cell_y * cols + next_x]:
+                            continue
+                        if blocked[next_y * cols + cell_x]:
+                            continue
+                        steps.append((next_index, (dx * diagonal, dy * diagonal)))
+                    else:
+                        sides.append(next_index)
+                        steps.append((next_index, (float(dx), float(dy))))
+                self._sides[index] = tuple(sides)
+                self._steps[index] = tuple(steps)
+
+    def cell_of(self, pos):
+        """Returns the (column, row) containing a position, clamped to the grid."""
+        cell_x = min(max(int(pos[0]) // self.cell_size, 0), self.cols - 1)
+        cell_y = min(max(int(pos[1]) // self.cell_size, 0), self.rows - 1)
+        return cell_x, cell_y
+
+    def update(self, target_pos):
+        """Points the field at a new target. Returns True if it had to be recomputed."""
+        target_cell = self.cell_of(target_pos)
+        if target_cell == self.target_cell:
+            return False
+        self.target_cell = target_cell
+        self._compute()
+        self.recomputes += 1
+        return True
+
+    def direction_at(self, pos):
+        """
+        Returns the unit vector to follow from a position, or None inside the
+        target cell or where the target can't be reached.
+        """
+        cell_x, cell_y = self.cell_of(pos)
+        return self.directions[cell_y * self.cols + cell_x]
+
+    def _compute(self):
+        # Breadth-first search outwards from the target over the four sides
+        cols, sides = self.cols, self._sides
+        distances = [-1] * (cols * self.rows)  # -1 means unreachable
+        target_x, target_y = self.target_cell
+        target = target_y * cols + target_x
+        distances[target] = 0
+        frontier = deque([target])
+        while frontier:
+            index = frontier.popleft()
+            next_distance = distances[index] + 1
+            for next_index in sides[index]:
+                if distances[next_index] == -1:
+                    distances[next_index] = next_distance
+                    frontier.append(next_index)
+        self.distances = distances
+
+        # Every reached cell points at its closest neighbour, sides before diagonals
+        directions = [None] * len(distances)
+        for index, steps in enumerate(self._steps):
+            best = distances[index]
+            if best <= 0:
+                continue  # The target cell itself, or unreachable
+            for next_index, direction in steps:
+                distance = distances[next_index]
+                if 0 <= distance < best:
+                    best = distance
+                    directions[index] = direction
+        self.directions = directions
+
+        if np is not None:
+            self.has_direction = np.array(
+                [direction is not None for direction in directions], dtype=bool
+            )
+            self.direction_array = np.array(
+                [direction or (0.0, 0.0) for direction in directions], dtype=float
+            )
@@ -0,0 +1,66 @@
+# fonts.py
+import pygame
+import constants as C
+
+# Every (face, size) the UI uses, loaded up front by warm_up_fonts()
+WARM_UP_FONTS = [
+    (None, C.FONT_SIZE_TEXT),
+    (None, C.FONT_SIZE_HEADER),
+    (None, C.FONT_SIZE_TITLE),
+    (None, C.FONT_SIZE_TITLE + 20),  # Main menu title
+]
+
+
+class FontRegistry:
+    """
+    A process-wide registry of pygame Font objects keyed by (face, size).
+    Parsing a font file is slow, so each combination is loaded once and
+    shared by every state and UI element that asks for it.
+    """
+
+    def __init__(self):
+        self._fonts = {}
+        self.fonts_created = 0
+        self.lookups = 0
+
+    def get(self, face, size):
+        """Returns the shared Font for a face (None for the default font) and size."""
+        self.lookups += 1
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self._fonts[key] = font
+            self.fonts_created += 1
+        return font
+
+    def warm_up(self, fonts=WARM_UP_FONTS):
+        """Loads a list of (face, size) pairs so the first frame never parses a font."""
+        for face, size in fonts:
+            self.get(face, size)
+
+    def stats(self):
+        """
+        Fonts loaded and lookups made. More fonts than WARM_UP_FONTS lists
+        means a screen asked for a size that isn't warmed up.
+        """
+        return {
+            "fonts": len(self._fonts),
+            "fonts_created": self.fonts_created,
+            "lookups": self.lookups,
+        }
+
+
+# Text caches key on the Font object, so sharing one per (face, size) also
+# lets their entries be shared between screens
+font_registry = FontRegistry()
+
+
+def get_font(face, size):
+    """Returns a shared Font. Use in place of pygame.font.Font(face, size)."""
+    return font_registry.get(face, size)
+
+
+def warm_up_fonts():
+    """Loads every font the UI uses. Call once after pygame.init()."""
+    font_registry.warm_up()
@@ -1,7 +1,12 @@
 # gamemap.py
-import random
+import time
+import constants as C
+from rng import get_rng
 from room import Room
 
+# Rooms that count as adjacent to the player's room
+NEIGHBOR_OFFSETS = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+
 
 class GameMap:
     """
@@ -31,6 +36,14 @@ class GameMap:
         self.rooms = {}
         self.explored_rooms = set()
 
+        # --- Background simulation of the rooms the player isn't in ---
+        self.sim_time = 0.0  # Seconds of simulation run in this dungeon
+        self._room_clock = {}  # coords -> sim_time the room was last stepped
+        self._far_rooms = []  # Every room, in the order distant rooms take turns
+        self._far_cursor = 0
+        # What the last update_background() call did, for profiling
+        self.background_stats = {"time_ms": 0.0, "rooms_stepped": 0, "deferred": 0}
+
         if map_data:
             # Load from existing data
             self.num_rooms = map_data["num_rooms"]
@@ -46,7 +59,7 @@ class GameMap:
             }
         else:
             # Generate a new map
-            self.num_rooms = random.randint(min_rooms, max_rooms)
+            self.num_rooms = get_rng("mapgen").randint(min_rooms, max_rooms)
             self.entry_direction = entry_direction
             self.current_room_coords = (0, 0)
             self._generate_dungeon()
@@ -86,7 +99,7 @@ class GameMap:
 
         while num_rooms_created < self.num_rooms:
             directions = [(0, -1), (0, 1), (1, 0), (-1, 0)]
-            (dx, dy) = random.choice(directions)
+            dx, dy = get_rng("mapgen").choice(directions)
 
             new_x = digger_x + dx
             new_y = digger_y + dy
@@ -105,6 +118,97 @@ class GameMap:
             f"--- Dungeon generation complete! Created a dungeon with {self.num_rooms} rooms ---"
         )
 
+    def update_background(self, dt, budget_ms=C.BACKGROUND_TICK_BUDGET_MS):
+        """
+        Keeps the rooms the player isn't in alive at a level of detail that
+        falls off with distance. Called once per tick after the current room
+        has been updated.
+
+        Rooms next to the player's room are stepped every LOD_NEAR_INTERVAL
+        seconds. Distant rooms take turns, LOD_FAR_ROOMS_PER_TICK per tick,
+        so the rooms visited per tick stay the same however big the dungeon
+        is. Every room keeps the time it is owed on its clock and is paid
+        back in steps of at most LOD_MAX_STEP whenever its turn comes round.
+
+        A tick takes at most BACKGROUND_TICK_MAX_STEPS room steps, and stops
+        early once budget_ms is used up. Whatever is left stays owed until a
+        later tick. Seeded runs pass budget_ms=None, so only the step count
+        limits them and they step the same rooms on every machine.
+        """
+        start = time.perf_counter()
+        if budget_ms is None:
+            deadline = float("inf")
+        else:
+            deadline = start + budget_ms / 1000
+        self.sim_time += dt
+        current = self.current_room_coords
+        self._room_clock[current] = self.sim_time
+        steps_left = C.BACKGROUND_TICK_MAX_STEPS
+        rooms_stepped = 0
+        deferred = 0
+
+        near = set()
+        for dx, dy in NEIGHBOR_OFFSETS:
+            coords = (current[0] + dx, current[1] + dy)
+            if coords not in self.rooms:
+                continue
+            near.add(coords)
+            if self.sim_time - self._room_clock.get(coords, 0.0) < C.LOD_NEAR_INTERVAL:
+                continue
+            if not steps_left or time.perf_counter() > deadline:
+                deferred += 1
+                continue
+            steps_left -= self._step_room(coords, steps_left, deadline)
+            rooms_stepped += 1
+
+        if len(self._far_rooms) != len(self.rooms):
+            self._far_rooms = list(self.rooms)
+        far_visits = min(C.LOD_FAR_ROOMS_PER_TICK, len(self._far_rooms))
+        checked = 0
+        # Look at each room at most once per tick when hunting for distant ones
+        while far_visits and checked < len(self._far_rooms):
+            coords = self._far_rooms[self._far_cursor]
+            checked += 1
+            if coords == current or coords in near:
+                self._advance_far_cursor()
+                continue
+            if not steps_left or time.perf_counter() > deadline:
+                deferred += far_visits
+                break
+            steps_left -= self._step_room(coords, steps_left, deadline)
+            self._advance_far_cursor()
+            rooms_stepped += 1
+            far_visits -= 1
+
+        self.background_stats = {
+            "time_ms": (time.perf_counter() - start) * 1000,
+            "rooms_stepped": rooms_stepped,
+            "room_steps": C.BACKGROUND_TICK_MAX_STEPS - steps_left,
+            "deferred": deferred,
+        }
+
+    def _advance_far_cursor(self):
+        self._far_cursor = (self._far_cursor + 1) % len(self._far_rooms)
+
+    def _step_room(self, coords, max_steps, deadline):
+        """
+        Pays a background room the time it is owed, in steps of at most
+        LOD_MAX_STEP. Returns the number of steps taken.
+        """
+        owed = self.sim_time - self._room_clock.get(coords, 0.0)
+        room = self.rooms[coords]
+        steps = 0
+        while owed > 0 and steps < max_steps:
+            if steps and time.perf_counter() > deadline:
+                break
+            step = min(owed, C.LOD_MAX_STEP)
+            room.update_background(step)
+            owed -= step
+            steps += 1
+        # Anything not paid yet stays owed until the room's next turn
+        self._room_clock[coords] = self.sim_time - owed
+        return steps
+
     def get_current_room(self):
         """Returns the Room object for the player's current coordinates."""
         return self.rooms.get(self.current_room_coords)
@@ -3,7 +3,10 @@
 import pygame
 import json
 import constants as C
+from assets import preload_sprites
+from display import SCALE_FILTERS, PipelinedPresenter, Presenter
 from factories import GENE_TEMPLATES
+from fonts import get_font, warm_up_fonts
 from gamemap import GameMap
 from gene import StatGene
 from item import Weapon
@@ -11,6 +14,9 @@ from ui_elements import Button
 from states import STATE_MAP, create_state
 from hero import Hero
 from game_context import GameContext
+from rng import rng
+from scheduler import FrameScheduler
+from timers import TimerManager
 
 # --- Developer flag to bypass character creation for quick testing ---
 DEV_SKIP_CHAR_CREATION = False
@@ -26,14 +32,49 @@ class Game:
         pygame.init()
         # Load settings
         self.settings = self._load_settings()
+        rng.reseed(self.settings["seed"])
+        # Only redraw and present the regions the active state reports as changed
+        self.dirty_rendering = self.settings["dirty_rects"]
         # The actual window the player sees, now resizable
         self.display_screen = None
+        self.presenter = None
         self.set_resolution(self.settings["resolution"])
-        # The surface we will draw our fixed-resolution game onto
-        self.virtual_screen = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT))
+        # Copies the virtual screen (or its dirty regions) onto the window,
+        # optionally on a worker thread while the next frame is updated
+        self.pipelined_present = self.settings["pipelined_present"]
+        presenter_class = PipelinedPresenter if self.pipelined_present else Presenter
+        self.presenter = presenter_class(
+            self.display_screen, self.settings["scale_filter"]
+        )
+        # The surfaces we draw our fixed-resolution game onto, in the display's
+        # pixel format so scaling them never needs a conversion. A pipelined
+        # presenter is still reading the last frame while the next one is
+        # drawn, so that mode alternates between two of them.
+        buffer_count = 2 if self.pipelined_present else 1
+        self.virtual_screens = [
+            pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)).convert()
+            for _ in range(buffer_count)
+        ]
+        self.virtual_screen = self.virtual_screens[0]
         pygame.display.set_caption("Title is a WIP")
+        # Decode every sprite once, now that the display mode exists for convert_alpha
+        preload_sprites()
+        # Parse every font the UI uses once, instead of on each state change
+        warm_up_fonts()
         self.clock = pygame.time.Clock()
         self.running = True
+        # The simulation advances in fixed steps, whatever the frame rate
+        self.tick_dt = 1 / self.settings["tick_rate"]
+        # How far the display is between the last two ticks (0 to 1)
+        self.render_alpha = 1.0
+        # Keeps AI and other per-entity work within a budget each tick. A
+        # fixed seed should replay the same run, so then it counts items.
+        if self.settings["seed"] is None:
+            self.scheduler = FrameScheduler()
+        else:
+            self.scheduler = FrameScheduler(budget_items=C.SCHEDULER_BUDGET_ITEMS)
+        # Delayed actions and tweens, so states never have to block the loop
+        self.timers = TimerManager()
 
         self.state_stack = []
         self.current_state = None
@@ -41,12 +82,36 @@ class Game:
 
     def _load_settings(self):
         """Loads settings from settings.json, with defaults."""
+        defaults = {
+            "resolution": (C.DEFAULT_SCREEN_WIDTH, C.DEFAULT_SCREEN_HEIGHT),
+            "dirty_rects": C.DIRTY_RECT_RENDERING,
+            "scale_filter": C.SCALE_FILTER,
+            "tick_rate": C.SIM_TICK_RATE,
+            "pipelined_present": C.PIPELINED_PRESENT,
+            # Fixed seed for reproducible runs; None gives every new game a fresh one
+            "seed": C.RNG_SEED,
+        }
         try:
             with open("settings.json", "r") as f:
-                return json.load(f)
+                # Fill in any keys that older settings files don't have yet
+                settings = {**defaults, **json.load(f)}
         except (FileNotFoundError, json.JSONDecodeError):
             # If file doesn't exist or is corrupt, return defaults
-            return {"resolution": (C.DEFAULT_SCREEN_WIDTH, C.DEFAULT_SCREEN_HEIGHT)}
+            return defaults
+
+        # The file can be edited by hand, so fall back on values we can't use
+        if settings["scale_filter"] not in SCALE_FILTERS:
+            print(
+                f"Unknown scale filter {settings['scale_filter']!r}, using the default"
+            )
+            settings["scale_filter"] = defaults["scale_filter"]
+        tick_rate = settings["tick_rate"]
+        if not isinstance(tick_rate, (int, float)) or not (
+            C.MIN_TICK_RATE <= tick_rate <= C.MAX_TICK_RATE
+        ):
+            print(f"Tick rate {tick_rate!r} is out of range, using the default")
+            settings["tick_rate"] = defaults["tick_rate"]
+        return settings
 
     def _save_settings(self):
         """Saves current settings to settings.json."""
@@ -56,9 +121,28 @@ class Game:
 
     def set_resolution(self, new_size):
         """Changes the window resolution and saves the setting."""
+        if self.presenter:
+            self.presenter.wait()  # Never swap the window under a frame in flight
         self.display_screen = pygame.display.set_mode(new_size, pygame.RESIZABLE)
         self.settings["resolution"] = new_size
         self._save_settings()
+        self._on_display_resized()
+
+    def set_scale_filter(self, scale_filter):
+        """Changes the filter used to scale the game to the window and saves the setting."""
+        self.presenter.set_filter(scale_filter)
+        self.settings["scale_filter"] = scale_filter
+        self._save_settings()
+        self.get_active_state().mark_dirty()
+
+    def _on_display_resized(self):
+        """Points the presenter at the new window and forces a full redraw."""
+        # Nothing to update yet while __init__ is still opening the first window
+        if not self.presenter:
+            return
+        self.presenter.resize(self.display_screen)
+        if self.state_stack:
+            self.get_active_state().mark_dirty()
 
     def setup_states(self):
         """Initializes all the game states and sets the starting state."""
@@ -110,8 +194,8 @@ class Game:
             "ui_elements": {},
         }
 
-        font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
-        font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
+        font_text = get_font(None, C.FONT_SIZE_TEXT)
+        font_title = get_font(None, C.FONT_SIZE_TITLE)
         data["ui_elements"]["name_box"] = pygame.Rect(50, 80, 300, 40)
         data["ui_elements"]["family_name_box"] = pygame.Rect(50, 160, 300, 40)
         stat_y_start = 280
@@ -154,12 +238,16 @@ class Game:
     def pop_state(self):
         """Pops the top state off the stack."""
         if len(self.state_stack) > 1:
-            self.state_stack.pop()
+            self.timers.cancel_owner(self.state_stack.pop())
+            # The uncovered state hasn't been presented since it was covered
+            self.get_active_state().mark_dirty()
 
     def flip_state(self):
         """Transitions to a completely new state, clearing the stack, using the factory."""
         next_state_name = self.get_active_state().next_state
 
+        for state in self.state_stack:
+            self.timers.cancel_owner(state)
         self.state_stack = []  # Clear the stack
 
         if next_state_name == "CHAR_CREATION":
@@ -177,6 +265,9 @@ class Game:
                 save_data = json.load(f)
 
             # Reconstruct Player and GameMap
+            # Carry on with the saved random streams (older saves have none)
+            if "rng" in save_data:
+                rng.load_dict(save_data["rng"])
             player = Hero.from_dict(save_data["player_data"])
             game_map = None
             if save_data["map_data"]:
@@ -239,73 +330,117 @@ class Game:
             "player_data": player.to_dict(current_room_coords=current_room_coords),
             "map_data": game_map.to_dict() if game_map else None,
             "last_state": state_key_to_save,
+            "rng": rng.to_dict(),
         }
 
         with open("savegame.json", "w") as f:
             json.dump(save_data, f, indent=4)
         print("Game saved successfully!")
 
-    def run(self):
-        """The main game loop."""
-        dt = 0
-        while self.running:
-            # Calculate mouse scaling factor
-            display_size = self.display_screen.get_size()
-            scale_x = C.INTERNAL_WIDTH / display_size[0]
-            scale_y = C.INTERNAL_HEIGHT / display_size[1]
-            # Get all events from the queue
-            events = pygame.event.get()
-
-            # Handle events
-            for event in events:
-                # --- Scale mouse position for relevant events ---
-                if event.type in [
-                    pygame.MOUSEBUTTONDOWN,
-                    pygame.MOUSEBUTTONUP,
-                    pygame.MOUSEMOTION,
-                ]:
-                    # Create a new, scaled position tuple
-                    scaled_pos = (
-                        int(event.pos[0] * scale_x),
-                        int(event.pos[1] * scale_y),
-                    )
-                    # Replace the event's position with the scaled one
-                    event.pos = scaled_pos
-                if event.type == pygame.QUIT:
-                    self.running = False
-                # --- Handle window resizing ---
-                if event.type == pygame.VIDEORESIZE:
-                    self.display_screen = pygame.display.set_mode(
-                        event.size, pygame.RESIZABLE
-                    )
-
-                # Pass events to the active state
-                self.get_active_state().handle_events(event)
-
-            # Update
-            self.get_active_state().update(dt)
-            if self.get_active_state().quit:
+    def process_events(self, events):
+        """Scales mouse positions to the virtual screen and passes events to the active state."""
+        # Calculate mouse scaling factor
+        display_size = self.display_screen.get_size()
+        scale_x = C.INTERNAL_WIDTH / display_size[0]
+        scale_y = C.INTERNAL_HEIGHT / display_size[1]
+
+        for event in events:
+            # --- Scale mouse position for relevant events ---
+            if event.type in [
+                pygame.MOUSEBUTTONDOWN,
+                pygame.MOUSEBUTTONUP,
+                pygame.MOUSEMOTION,
+            ]:
+                # Create a new, scaled position tuple
+                scaled_pos = (
+                    int(event.pos[0] * scale_x),
+                    int(event.pos[1] * scale_y),
+                )
+                # Replace the event's position with the scaled one
+                event.pos = scaled_pos
+            if event.type == pygame.QUIT:
                 self.running = False
-            elif self.get_active_state().done:
-                self.flip_state()
+            # --- Handle window resizing ---
+            if event.type == pygame.VIDEORESIZE:
+                self.presenter.wait()
+                self.display_screen = pygame.display.set_mode(
+                    event.size, pygame.RESIZABLE
+                )
+                self._on_display_resized()
+
+            # Pass events to the active state
+            self.get_active_state().handle_events(event)
+
+    def update(self, dt):
+        """Advances the active state and follows any state change it requests."""
+        # Timers owned by states further down the stack wait until they're active again
+        self.timers.update(dt, self.get_active_state())
+        self.get_active_state().update(dt)
+        if self.get_active_state().quit:
+            self.running = False
+        elif self.get_active_state().done:
+            self.flip_state()
+
+    def draw(self):
+        """
+        Draws the active state to the virtual screen. Returns the dirty rects
+        to present: None for the whole frame, an empty list if nothing changed.
+        """
+        active_state = self.get_active_state()
+        dirty_rects = None  # None means present the whole frame
+        if self.dirty_rendering:
+            dirty_rects = active_state.take_dirty_rects()
+        # An empty list means nothing changed, so skip drawing entirely
+        if dirty_rects is None or dirty_rects:
+            active_state.draw(self.virtual_screen)
+        return dirty_rects
+
+    def present(self, dirty_rects):
+        """Scales the virtual screen (or its dirty regions) to the display."""
+        self.presenter.present(self.virtual_screen, dirty_rects)
+        if len(self.virtual_screens) > 1 and (dirty_rects is None or dirty_rects):
+            # The presenter may still be reading this frame, so draw into the other buffer
+            self.virtual_screens.reverse()
+            self.virtual_screen = self.virtual_screens[0]
 
-            # Draw
+    def run(self):
+        """
+        The main game loop. Rendering runs once per frame, while the
+        simulation runs in fixed ticks of tick_dt seconds: each frame adds
+        the elapsed time to an accumulator and runs as many ticks as fit.
+        If a frame falls too far behind, the backlog is dropped after
+        MAX_CATCH_UP_TICKS so the game slows down instead of stalling.
+        """
+        accumulator = 0.0
+        self.clock.tick()  # Don't count loading time as elapsed game time
+        while self.running:
+            accumulator += self.clock.tick(C.FPS) / 1000
+            self.process_events(pygame.event.get())
+
+            ticks = 0
+            while accumulator >= self.tick_dt and self.running:
+                if ticks == C.MAX_CATCH_UP_TICKS:
+                    accumulator = 0.0
+                    break
+                self.update(self.tick_dt)
+                accumulator -= self.tick_dt
+                ticks += 1
+
+            # Dirty-rect frames are only redrawn when a tick moved something,
+            # so they draw the latest tick rather than interpolating
+            if self.dirty_rendering:
+                self.render_alpha = 1.0
+            else:
+                self.render_alpha = min(accumulator / self.tick_dt, 1.0)
             # --- Draw to the virtual screen first ---
-            self.get_active_state().draw(self.virtual_screen)
-
-            # --- Scale the virtual screen to the display screen ---
-            scaled_surface = pygame.transform.scale(
-                self.virtual_screen, self.display_screen.get_rect().size
-            )
-            self.display_screen.blit(scaled_surface, (0, 0))
-
-            # Update the actual display
-            pygame.display.flip()
-            dt = self.clock.tick(C.FPS) / 1000
+            dirty_rects = self.draw()
+            # --- Scale the virtual screen (or its dirty regions) to the display ---
+            self.present(dirty_rects)
 
 
 if __name__ == "__main__":
     game = Game()
     game.setup_states()
     game.run()
+    game.presenter.close()
     pygame.quit()
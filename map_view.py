@@ -1,147 +1,224 @@
 # map_view.py
+import weakref
 import pygame
 import constants as C
-
-
-def draw_map(screen, game_map):
+from overlays import get_overlay
+
+# Where the dungeon's exit tile sits relative to the starting room
+EXIT_OFFSETS = {"NORTH": (0, -1), "SOUTH": (0, 1), "WEST": (-1, 0), "EAST": (1, 0)}
+# Neighbour offsets and the tile edge a connection to that neighbour leaves from
+NEIGHBOR_EDGES = [
+    ((0, -1), "midtop"),
+    ((0, 1), "midbottom"),
+    ((1, 0), "midright"),
+    ((-1, 0), "midleft"),
+]
+# Which edges of the start room and the exit icon the exit line joins
+EXIT_LINE_EDGES = {
+    "NORTH": ("midtop", "midbottom"),
+    "SOUTH": ("midbottom", "midtop"),
+    "WEST": ("midleft", "midright"),
+    "EAST": ("midright", "midleft"),
+}
+
+
+class MapRenderer:
     """
-    Draws a full-screen map overlay, now correctly showing all connections,
-    walls, and hints for unexplored paths in all four directions.
+    Keeps a persistent picture of one GameMap's explored rooms so the map
+    overlay doesn't have to be rebuilt from scratch every frame.
+
+    Every room owns one cell on the map: its tile plus half of the margin on
+    each side, which holds its half of every connection line. Cells are
+    baked into fixed-size chunk surfaces and only redrawn when the room is
+    first explored, when a neighbour is explored (its stub becomes a full
+    connection) or when the room's is_cleared flag changes. Drawing the map
+    is then a few chunk blits panned around the player's room, plus the
+    player highlight and the exit icon on top.
     """
-    # --- Create Overlay Surface ---
-    overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-    overlay.fill(C.MAP_BG)
-
-    # --- Map Drawing Parameters ---
-    room_size = 20
-    room_margin = 10
-    total_tile_size = room_size + room_margin
-
-    screen_center_x = screen.get_width() / 2
-    screen_center_y = screen.get_height() / 2
-    player_room_coords = game_map.current_room_coords
-
-    # --- Pass 1: Draw each explored room's square ---
-    room_rects = {}
-    for room_coords in game_map.explored_rooms:
-        room = game_map.rooms.get(room_coords)
+
+    CHUNK_CELLS = 16  # Chunks are CHUNK_CELLS x CHUNK_CELLS rooms
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.room_size = C.MAP_ROOM_SIZE
+        self.half_margin = C.MAP_ROOM_MARGIN // 2
+        self.cell_size = C.MAP_ROOM_SIZE + C.MAP_ROOM_MARGIN
+        self.chunk_size = self.cell_size * self.CHUNK_CELLS
+        self._chunks = {}  # (chunk_x, chunk_y) -> Surface
+        self._drawn = {}  # room coords -> is_cleared when its cell was last drawn
+        self._uncleared = set()  # Cells last drawn for a room with enemies left
+        self.cells_drawn = 0
+
+    def sync(self):
+        """Redraws only the cells whose room changed since the last call."""
+        explored = self.game_map.explored_rooms
+        if len(explored) != len(self._drawn):
+            new_rooms = [coords for coords in explored if coords not in self._drawn]
+            for coords in new_rooms:
+                self._draw_cell(coords)
+            # Explored neighbours now connect to these rooms instead of showing a stub
+            new_room_set = set(new_rooms)
+            for x, y in new_rooms:
+                for (dx, dy), _ in NEIGHBOR_EDGES:
+                    neighbor = (x + dx, y + dy)
+                    if neighbor in self._drawn and neighbor not in new_room_set:
+                        self._draw_cell(neighbor)
+
+        # A room can be cleared while the map is closed and the player has
+        # moved on since. Rooms never go back to uncleared, so only the cells
+        # drawn as uncleared need checking.
+        rooms = self.game_map.rooms
+        cleared = [coords for coords in self._uncleared if rooms[coords].is_cleared]
+        for coords in cleared:
+            self._draw_cell(coords)
+
+    def refresh(self):
+        """Throws away every cached cell so the whole map is redrawn on next use."""
+        self._chunks.clear()
+        self._drawn.clear()
+        self._uncleared.clear()
+
+    def _get_chunk(self, chunk_coords):
+        chunk = self._chunks.get(chunk_coords)
+        if chunk is None:
+            chunk = pygame.Surface(
+                (self.chunk_size, self.chunk_size), pygame.SRCALPHA
+            ).convert_alpha()
+            chunk.fill((0, 0, 0, 0))
+            self._chunks[chunk_coords] = chunk
+        return chunk
+
+    def _tile_rect(self, left, top):
+        """Returns the room square inside the cell whose top-left corner is given."""
+        return pygame.Rect(
+            left + self.half_margin,
+            top + self.half_margin,
+            self.room_size,
+            self.room_size,
+        )
+
+    def _draw_cell(self, coords):
+        room = self.game_map.rooms.get(coords)
         if not room:
-            continue
-        rel_x = room_coords[0] - player_room_coords[0]
-        rel_y = room_coords[1] - player_room_coords[1]
-        draw_x = screen_center_x + rel_x * total_tile_size - (room_size / 2)
-        draw_y = screen_center_y + rel_y * total_tile_size - (room_size / 2)
-        rect = pygame.Rect(draw_x, draw_y, room_size, room_size)
-        room_rects[room_coords] = rect
-
-        # Determine color
-        if room_coords == player_room_coords:
-            color = C.MAP_PLAYER
-        elif room.is_cleared:
-            color = C.MAP_CLEARED
-        else:
-            color = C.MAP_EXPLORED
-
-        pygame.draw.rect(overlay, color, rect)
-
-    # --- Draw the explicit exit icon ---
-    exit_map = {"NORTH": (0, -1), "SOUTH": (0, 1), "WEST": (-1, 0), "EAST": (1, 0)}
-    if game_map.entry_direction in exit_map:
-        exit_coords = exit_map[game_map.entry_direction]
-        rel_x = exit_coords[0] - player_room_coords[0]
-        rel_y = exit_coords[1] - player_room_coords[1]
-        draw_x = screen_center_x + rel_x * total_tile_size - (room_size / 2)
-        draw_y = screen_center_y + rel_y * total_tile_size - (room_size / 2)
-        exit_rect = pygame.Rect(draw_x, draw_y, room_size, room_size)
-        pygame.draw.rect(overlay, C.MAP_EXIT, exit_rect, border_radius=4)
-
-    # --- Pass 2: Draw connections and hints for ALL FOUR directions ---
-    for room_coords, rect in room_rects.items():
-        x, y = room_coords
-
-        # Define neighbor coordinates
-        north_coords = (x, y - 1)
-        south_coords = (x, y + 1)
-        east_coords = (x + 1, y)
-        west_coords = (x - 1, y)
-
-        # Check NORTH
-        if north_coords in room_rects:
-            pygame.draw.line(
-                overlay,
-                C.MAP_CONNECTION,
-                rect.midtop,
-                room_rects[north_coords].midbottom,
-                2,
+            # Still remember it, so the explored count stays in step
+            self._drawn[coords] = None
+            return
+
+        x, y = coords
+        chunk = self._get_chunk((x // self.CHUNK_CELLS, y // self.CHUNK_CELLS))
+        cell_left = (x % self.CHUNK_CELLS) * self.cell_size
+        cell_top = (y % self.CHUNK_CELLS) * self.cell_size
+        chunk.fill((0, 0, 0, 0), (cell_left, cell_top, self.cell_size, self.cell_size))
+
+        tile = self._tile_rect(cell_left, cell_top)
+        color = C.MAP_CLEARED if room.is_cleared else C.MAP_EXPLORED
+        pygame.draw.rect(chunk, color, tile)
+
+        # Half of each connection, from the tile's edge out to the cell's edge.
+        # The neighbour's cell draws the other half.
+        for (dx, dy), edge in NEIGHBOR_EDGES:
+            neighbor = (x + dx, y + dy)
+            if neighbor not in self.game_map.rooms:
+                continue
+            if neighbor in self.game_map.explored_rooms:
+                line_color = C.MAP_CONNECTION
+            else:
+                line_color = C.MAP_UNEXPLORED_PATH
+            start_pos = getattr(tile, edge)
+            end_pos = (
+                start_pos[0] + dx * self.half_margin,
+                start_pos[1] + dy * self.half_margin,
             )
-        elif north_coords in game_map.rooms:
-            start_pos = rect.midtop
-            end_pos = (start_pos[0], start_pos[1] - room_margin / 2)
-            pygame.draw.line(overlay, C.MAP_UNEXPLORED_PATH, start_pos, end_pos, 2)
-
-        # Check SOUTH
-        if south_coords in room_rects:
-            pygame.draw.line(
-                overlay,
-                C.MAP_CONNECTION,
-                rect.midbottom,
-                room_rects[south_coords].midtop,
-                2,
-            )
-        elif south_coords in game_map.rooms:
-            start_pos = rect.midbottom
-            end_pos = (start_pos[0], start_pos[1] + room_margin / 2)
-            pygame.draw.line(overlay, C.MAP_UNEXPLORED_PATH, start_pos, end_pos, 2)
-
-        # Check EAST
-        if east_coords in room_rects:
-            pygame.draw.line(
-                overlay,
-                C.MAP_CONNECTION,
-                rect.midright,
-                room_rects[east_coords].midleft,
-                2,
-            )
-        elif east_coords in game_map.rooms:
-            start_pos = rect.midright
-            end_pos = (start_pos[0] + room_margin / 2, start_pos[1])
-            pygame.draw.line(overlay, C.MAP_UNEXPLORED_PATH, start_pos, end_pos, 2)
-
-        # Check WEST
-        if west_coords in room_rects:
-            pygame.draw.line(
-                overlay,
-                C.MAP_CONNECTION,
-                rect.midleft,
-                room_rects[west_coords].midright,
-                2,
+            pygame.draw.line(chunk, line_color, start_pos, end_pos, 2)
+
+        self._drawn[coords] = room.is_cleared
+        if room.is_cleared:
+            self._uncleared.discard(coords)
+        else:
+            self._uncleared.add(coords)
+        self.cells_drawn += 1
+
+    def _tile_on_screen(self, coords, offset):
+        return self._tile_rect(
+            coords[0] * self.cell_size + offset[0],
+            coords[1] * self.cell_size + offset[1],
+        )
+
+    def draw(self, screen):
+        """Draws the map overlay centred on the player's current room."""
+        self.sync()
+        screen.blit(get_overlay(screen.get_size(), C.MAP_BG), (0, 0))
+
+        # Offset that moves map-space pixels into screen space, so the
+        # centre of the player's cell lands in the middle of the screen
+        player_coords = self.game_map.current_room_coords
+        half_cell = self.cell_size // 2
+        offset = (
+            screen.get_width() // 2 - player_coords[0] * self.cell_size - half_cell,
+            screen.get_height() // 2 - player_coords[1] * self.cell_size - half_cell,
+        )
+
+        # Only blit the chunks that overlap the screen
+        view = screen.get_rect().move(-offset[0], -offset[1])
+        first_x, last_x = (
+            view.left // self.chunk_size,
+            (view.right - 1) // self.chunk_size,
+        )
+        first_y, last_y = (
+            view.top // self.chunk_size,
+            (view.bottom - 1) // self.chunk_size,
+        )
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk = self._chunks.get((chunk_x, chunk_y))
+                if chunk:
+                    screen.blit(
+                        chunk,
+                        (
+                            chunk_x * self.chunk_size + offset[0],
+                            chunk_y * self.chunk_size + offset[1],
+                        ),
+                    )
+
+        # The player's room is highlighted on top of the cached picture
+        if player_coords in self._drawn:
+            pygame.draw.rect(
+                screen, C.MAP_PLAYER, self._tile_on_screen(player_coords, offset)
             )
-        elif west_coords in game_map.rooms:
-            start_pos = rect.midleft
-            end_pos = (start_pos[0] - room_margin / 2, start_pos[1])
-            pygame.draw.line(overlay, C.MAP_UNEXPLORED_PATH, start_pos, end_pos, 2)
-
-    # --- NEW: Pass 3: Draw the line connecting the entrance to the exit ---
-    start_room_rect = room_rects.get((0, 0))
-    if start_room_rect and exit_rect:
-        start_pos = start_room_rect.center
-        end_pos = exit_rect.center
-
-        # Connect the correct edges for a cleaner look
-        if game_map.entry_direction == "NORTH":
-            start_pos = start_room_rect.midtop
-            end_pos = exit_rect.midbottom
-        elif game_map.entry_direction == "SOUTH":
-            start_pos = start_room_rect.midbottom
-            end_pos = exit_rect.midtop
-        elif game_map.entry_direction == "WEST":
-            start_pos = start_room_rect.midleft
-            end_pos = exit_rect.midright
-        elif game_map.entry_direction == "EAST":
-            start_pos = start_room_rect.midright
-            end_pos = exit_rect.midleft
-
-        pygame.draw.line(overlay, C.MAP_EXIT, start_pos, end_pos, 2)
-
-    # Blit the final overlay onto the main screen
-    screen.blit(overlay, (0, 0))
+
+        # --- Draw the explicit exit icon and the line from the entrance to it ---
+        entry_direction = self.game_map.entry_direction
+        if entry_direction in EXIT_OFFSETS:
+            exit_rect = self._tile_on_screen(EXIT_OFFSETS[entry_direction], offset)
+            pygame.draw.rect(screen, C.MAP_EXIT, exit_rect, border_radius=4)
+            if (0, 0) in self._drawn:
+                start_edge, exit_edge = EXIT_LINE_EDGES[entry_direction]
+                start_rect = self._tile_on_screen((0, 0), offset)
+                pygame.draw.line(
+                    screen,
+                    C.MAP_EXIT,
+                    getattr(start_rect, start_edge),
+                    getattr(exit_rect, exit_edge),
+                    2,
+                )
+
+
+# One renderer per map, dropped automatically when the map is discarded
+_renderers = weakref.WeakKeyDictionary()
+
+
+def get_map_renderer(game_map):
+    """Returns the persistent MapRenderer for a GameMap, creating it on first use."""
+    renderer = _renderers.get(game_map)
+    if renderer is None:
+        renderer = MapRenderer(game_map)
+        _renderers[game_map] = renderer
+    return renderer
+
+
+def draw_map(screen, game_map):
+    """
+    Draws a full-screen map overlay, showing all connections, walls, and
+    hints for unexplored paths in all four directions.
+    """
+    get_map_renderer(game_map).draw(screen)
@@ -1,6 +1,7 @@
 # npc.py
 import pygame
 import constants as C
+from assets import get_sprite
 
 
 class NPC(pygame.sprite.Sprite):
@@ -22,11 +23,9 @@ class NPC(pygame.sprite.Sprite):
         self.vendor_id = template_data.get("vendor_id", None)
 
         # Visual representation
-        # --- Load image from file if it exists ---
+        # --- Use the shared sprite from the asset cache if it exists ---
         if sprite_filename:
-            # .convert_alpha() is important for handling transparency
-            loaded_image = pygame.image.load(sprite_filename).convert_alpha()
-            self.image = pygame.transform.scale(loaded_image, C.SPRITE_SIZE)
+            self.image = get_sprite(sprite_filename, C.SPRITE_SIZE)
         else:
             # Fallback to the colored square if no sprite is defined
             self.image = pygame.Surface((32, 32))
@@ -0,0 +1,56 @@
+# overlays.py
+import pygame
+
+
+class OverlayCache:
+    """
+    Prebuilt full-screen translucent surfaces for modal screens and the map.
+    Each (size, rgba) overlay is built once instead of allocating and
+    filling a new SRCALPHA surface every frame. Requesting a new size means
+    the internal resolution changed, so everything cached for the old one
+    is thrown away.
+    """
+
+    def __init__(self):
+        self._overlays = {}
+        self.size = None
+        self.overlays_built = 0
+
+    def get(self, size, rgba):
+        """Returns the shared overlay surface of a given size and RGBA color."""
+        size = tuple(size)
+        if size != self.size:
+            self.invalidate()
+            self.size = size
+
+        rgba = tuple(rgba)
+        overlay = self._overlays.get(rgba)
+        if overlay is None:
+            # A uniform tint only needs surface alpha, which blits faster
+            # than per-pixel alpha and looks identical
+            overlay = pygame.Surface(size).convert()
+            overlay.fill(rgba[:3])
+            overlay.set_alpha(rgba[3] if len(rgba) > 3 else 255)
+            self._overlays[rgba] = overlay
+            self.overlays_built += 1
+        return overlay
+
+    def invalidate(self):
+        """Drops every cached overlay, e.g. after the internal resolution changes."""
+        self._overlays.clear()
+        self.size = None
+
+
+# Only a handful of tints exist (modal backdrops, the map), so one small
+# cache holds them all
+overlay_cache = OverlayCache()
+
+
+def get_overlay(size, rgba):
+    """Returns a cached translucent overlay from the global cache."""
+    return overlay_cache.get(size, rgba)
+
+
+def invalidate_overlays():
+    """Clears the global overlay cache."""
+    overlay_cache.invalidate()
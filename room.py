@@ -1,7 +1,12 @@
 # room.py
 import pygame
-import random
+import constants as C
+from ai_batch import BATCHING_AVAILABLE, EnemyBatch
+from entity import BaseEntity
 from factories import create_enemy, get_available_enemy_types
+from flowfield import FlowField
+from rng import get_rng
+from spatial import SpatialHash
 
 
 class Room:
@@ -20,6 +25,16 @@ class Room:
         self.npcs = pygame.sprite.Group()
         self.loot = pygame.sprite.Group()  # For later use
         self.is_cleared = False
+        # Vectorized AI for crowded rooms, rebuilt when the enemies change
+        self._ai_batch = None
+        # Broadphase grids for collision and proximity checks. Enemies keep
+        # their own entry up to date as they move and remove it when killed.
+        self.enemy_index = SpatialHash(C.SPATIAL_CELL_SIZE)
+        self.npc_index = SpatialHash(C.SPATIAL_CELL_SIZE)
+        # Rects enemies path around, and the field that steers them past.
+        # An open room has no field: the straight line is already the shortest.
+        self.obstacles = []
+        self.flow_field = None
 
         # --- Handle both random spawning and loading ---
         if saved_enemies is not None:  # Note: Check for None, as an empty list is valid
@@ -34,24 +49,46 @@ class Room:
         """A helper method to add a sprite to the all_sprites group."""
         self.all_sprites.add(sprite)
 
+    def add_enemy(self, enemy):
+        """Adds an enemy to the room's sprite groups and its spatial index."""
+        self.all_sprites.add(enemy)
+        self.enemies.add(enemy)
+        self.enemy_index.insert(enemy, enemy.rect)
+        enemy.spatial_index = self.enemy_index
+
+    def enemies_colliding_with(self, rect):
+        """Returns the enemies whose rect overlaps the given rect."""
+        return self.enemy_index.query_rect(rect)
+
+    def npcs_near(self, pos, radius):
+        """Returns the NPCs whose centre is within radius of pos, nearest first."""
+        return self.npc_index.query_radius(pos, radius)
+
+    def set_obstacles(self, obstacles):
+        """Sets the rects chasing enemies route around and rebuilds the flow field."""
+        self.obstacles = [pygame.Rect(obstacle) for obstacle in obstacles]
+        if self.obstacles:
+            self.flow_field = FlowField(self.width, self.height, self.obstacles)
+        else:
+            self.flow_field = None
+
     def spawn_enemies(self):
         """Create a random number and type of enemies using the new factory system."""
 
-        num_enemies = random.randint(1, 3)
+        spawn_rng = get_rng("spawn")
+        num_enemies = spawn_rng.randint(1, 3)
         available_enemy_types = get_available_enemy_types()
 
         for _ in range(num_enemies):
-            x = random.randint(self.width // 2, self.width - 50)
-            y = random.randint(50, self.height - 50)
+            x = spawn_rng.randint(self.width // 2, self.width - 50)
+            y = spawn_rng.randint(50, self.height - 50)
 
             # Choose a random enemy type (e.g., "goblin" or "orc")
-            enemy_type = random.choice(available_enemy_types)
+            enemy_type = spawn_rng.choice(available_enemy_types)
 
             # Use the single factory function to create the enemy
             enemy = create_enemy(enemy_type, x, y)
-
-            self.all_sprites.add(enemy)
-            self.enemies.add(enemy)
+            self.add_enemy(enemy)
 
     def spawn_from_save(self, saved_enemies):
         """Creates specific enemies from a list of saved data."""
@@ -64,25 +101,84 @@ class Room:
             )
             # Restore its specific health
             enemy.health = enemy_data["health"]
-            self.all_sprites.add(enemy)
-            self.enemies.add(enemy)
-
-    def update(self, player):
-        """Update all objects in the room."""
+            self.add_enemy(enemy)
+
+    def begin_tick(self):
+        """Records where every entity starts this tick, for render interpolation."""
+        for sprite in self.all_sprites:
+            if isinstance(sprite, BaseEntity):
+                sprite.begin_tick()
+
+    def update(self, player, dt, scheduler=None):
+        """
+        Update all objects in the room. With a FrameScheduler the enemy AI is
+        queued on it to run within the tick's budget, otherwise it runs now.
+        """
+        # One path search for every chasing enemy, redone only when the
+        # player moves into another cell
+        flow_field = self.flow_field
+        if flow_field is not None and self.enemies:
+            flow_field.update(player.rect.center)
         # Update AI for all enemies in this room
-        for enemy in self.enemies:
-            enemy.update_ai(player, self.width, self.height)
+        if BATCHING_AVAILABLE and len(self.enemies) >= C.AI_BATCH_MIN_ENEMIES:
+            if self._ai_batch is None or not self._ai_batch.matches(self.enemies):
+                self.release_ai_batch()
+                self._ai_batch = EnemyBatch(self.enemies)
+            # The whole batch is a single unit of work
+            units = [self._ai_batch]
+
+            def work(batch, step_dt):
+                batch.step(player, self.width, self.height, step_dt, flow_field)
+
+        else:
+            # A few enemies are cheaper to update one by one
+            self.release_ai_batch()
+            units = self.enemies.sprites()
+
+            def work(enemy, step_dt):
+                enemy.update_ai(player, self.width, self.height, step_dt, flow_field)
+
+        if scheduler is not None:
+            scheduler.submit("room_ai", units, work, priority=C.PRIORITY_ROOM_AI)
+        else:
+            for unit in units:
+                work(unit, dt)
         if not self.enemies:
             self.is_cleared = True
 
-    def draw(self, screen):
-        """Draw everything in the room."""
-        # Draw all sprites at once
-        self.all_sprites.draw(screen)
+    def update_background(self, dt):
+        """Cheap update for a room the player isn't in: its enemies just wander."""
+        self.release_ai_batch()
+        for enemy in self.enemies:
+            enemy.state = "WANDERING"
+            enemy.wander(self.width, self.height, dt)
+
+    def release_ai_batch(self):
+        """Hands the AI state back to the Enemy objects and drops the batch."""
+        if self._ai_batch is not None:
+            self._ai_batch.write_back()
+            self._ai_batch = None
+
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw everything in the room. alpha is how far the display is between
+        the previous simulation tick and the current one.
+        """
+        if alpha >= 1:
+            # Draw all sprites at once
+            self.all_sprites.draw(screen)
+            return
+        for sprite in self.all_sprites:
+            if isinstance(sprite, BaseEntity):
+                screen.blit(sprite.image, sprite.interpolated_topleft(alpha))
+            else:
+                screen.blit(sprite.image, sprite.rect)
 
     def add_player(self, player):
         """Adds the player sprite to this room's sprite group."""
         self.all_sprites.add(player)
+        # The player arrives from elsewhere, so don't slide in from the old spot
+        player.reset_interpolation()
 
     def remove_player(self, player):
         """Removes the player sprite from this room's sprite group."""
@@ -92,6 +188,7 @@ class Room:
         """Adds an NPC to the room's sprite groups."""
         self.all_sprites.add(npc)
         self.npcs.add(npc)
+        self.npc_index.insert(npc, npc.rect)
 
     def to_dict(self):
         """Converts the room's state to a dictionary."""
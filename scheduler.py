@@ -0,0 +1,120 @@
+# scheduler.py
+import time
+import constants as C
+
+
+class FrameScheduler:
+    """
+    Runs per-entity work, like enemy AI, inside a fixed time budget per tick.
+
+    Systems submit their items for the tick with submit(). run() then works
+    through the systems in priority order and runs items until the budget is
+    spent. A system whose items don't all fit picks up where it stopped on
+    the next tick (round-robin), so every item gets its turn. An item that
+    waited is handed all the time it missed (up to SCHEDULER_MAX_CATCH_UP)
+    so it doesn't fall behind. Each system always runs at least min_items
+    items, so a low-priority system never stalls completely.
+
+    With budget_items set, the budget is a number of items instead of
+    milliseconds. Which items run then no longer depends on how fast the
+    machine is, so a seeded run replays the same way (see rng.py).
+    """
+
+    def __init__(self, budget_ms=C.SCHEDULER_BUDGET_MS, budget_items=None):
+        self.budget_ms = budget_ms
+        self.budget_items = budget_items
+        self.tick = 0
+        self._jobs = []
+        self._deadline = 0.0
+        self._items_left = 0
+        self._cursors = {}  # system -> index of the next item to run
+        self._last_run = {}  # system -> {item: tick it last ran}, submitted items only
+        self._system_ticks = {}  # system -> last tick it was submitted on
+        # Per-system counters, see stats()
+        self._stats = {}
+        self.last_run_ms = 0.0
+
+    def submit(self, system, items, work, priority=0, min_items=1):
+        """
+        Queues a system's items for this tick. work(item, dt) is called for
+        each item that fits in the budget. Higher priorities run first.
+        """
+        self._jobs.append((priority, system, list(items), work, min_items))
+
+    def remaining_ms(self):
+        """Milliseconds left in the current tick's budget (0 outside run())."""
+        return max(0.0, (self._deadline - time.perf_counter()) * 1000)
+
+    def run(self, dt):
+        """Runs the queued work for one tick of dt seconds, highest priority first."""
+        start = time.perf_counter()
+        self._deadline = start + self.budget_ms / 1000
+        self._items_left = self.budget_items or 0
+        self.tick += 1
+        # Stable sort: equal priorities keep the order they were submitted in
+        jobs = sorted(self._jobs, key=lambda job: -job[0])
+        self._jobs = []
+        for _, system, items, work, min_items in jobs:
+            self._run_system(system, items, work, min_items, dt)
+        self._deadline = 0.0
+        self.last_run_ms = (time.perf_counter() - start) * 1000
+
+    def _run_system(self, system, items, work, min_items, dt):
+        stats = self._stats.setdefault(
+            system, {"ticks": 0, "ticks_deferred": 0, "updates": 0, "deferred": 0}
+        )
+        stats["ticks"] += 1
+        # Only the ticks an item was submitted and deferred count as missed.
+        # Items left out of this tick (killed enemies, rooms left behind) are
+        # forgotten, so one that comes back later starts over with a plain dt
+        # instead of catching up on time something else already simulated.
+        first_tick = self.tick - 1
+        previous = self._last_run.get(system, {})
+        if self._system_ticks.get(system) != first_tick:
+            previous = {}  # The whole system sat out the last tick
+        self._system_ticks[system] = self.tick
+        last_run = {item: previous.get(item, first_tick) for item in items}
+        self._last_run[system] = last_run
+        if not items:
+            return
+        count = len(items)
+        cursor = self._cursors.get(system, 0) % count
+        ran = 0
+        while ran < count:
+            if ran >= min_items and self._out_of_budget():
+                break
+            item = items[(cursor + ran) % count]
+            waited = self.tick - last_run[item]
+            last_run[item] = self.tick
+            work(item, min(waited * dt, max(dt, C.SCHEDULER_MAX_CATCH_UP)))
+            self._items_left -= 1
+            ran += 1
+
+        self._cursors[system] = (cursor + ran) % count
+        stats["updates"] += ran
+        if ran < count:
+            stats["deferred"] += count - ran
+            stats["ticks_deferred"] += 1
+
+    def _out_of_budget(self):
+        if self.budget_items is not None:
+            return self._items_left <= 0
+        return time.perf_counter() > self._deadline
+
+    def stats(self):
+        """
+        Returns per-system counters: ticks run, ticks where some items had to
+        wait, items updated, items deferred and the share of ticks deferred.
+        """
+        report = {}
+        for system, stats in self._stats.items():
+            report[system] = {
+                **stats,
+                "deferral_rate": (
+                    stats["ticks_deferred"] / stats["ticks"] if stats["ticks"] else 0.0
+                ),
+            }
+        return report
+
+    def reset_stats(self):
+        self._stats.clear()
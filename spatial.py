@@ -0,0 +1,113 @@
+# spatial.py
+import pygame
+
+
+class SpatialHash:
+    """
+    A uniform grid that buckets objects by the cells their rect overlaps.
+    Point, rect and radius queries only look at the few cells they touch,
+    so their cost depends on how crowded that spot is rather than on how
+    many objects are stored. Moving objects call update() with their new
+    rect, which is cheap while they stay inside the same cells.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}  # (cell_x, cell_y) -> list of objects
+        self._entries = {}  # object -> (rect, range of cells it was inserted into)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size,
+        )
+
+    @staticmethod
+    def _cells_in(cell_range):
+        first_x, first_y, last_x, last_y = cell_range
+        return [
+            (cell_x, cell_y)
+            for cell_x in range(first_x, last_x + 1)
+            for cell_y in range(first_y, last_y + 1)
+        ]
+
+    def insert(self, obj, rect):
+        """Adds an object covering the given rect."""
+        rect = pygame.Rect(rect)
+        cell_range = self._cell_range(rect)
+        for cell in self._cells_in(cell_range):
+            self._cells.setdefault(cell, []).append(obj)
+        self._entries[obj] = (rect, cell_range)
+
+    def update(self, obj, rect):
+        """
+        Moves a stored object to a new rect, or inserts it if it isn't stored.
+        Only touches the buckets when the object crossed into other cells.
+        """
+        entry = self._entries.get(obj)
+        if entry is None:
+            self.insert(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        if self._cell_range(rect) == entry[1]:
+            self._entries[obj] = (rect, entry[1])
+        else:
+            self.remove(obj)
+            self.insert(obj, rect)
+
+    def remove(self, obj):
+        """Removes an object. Does nothing if it isn't stored."""
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return
+        for cell in self._cells_in(entry[1]):
+            bucket = self._cells[cell]
+            bucket.remove(obj)
+            if not bucket:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def query_point(self, pos):
+        """Returns the objects whose rect contains the point, in insertion order."""
+        size = self.cell_size
+        bucket = self._cells.get((int(pos[0]) // size, int(pos[1]) // size), [])
+        return [obj for obj in bucket if self._entries[obj][0].collidepoint(pos)]
+
+    def query_rect(self, rect):
+        """Returns the objects whose rect overlaps the given rect."""
+        rect = pygame.Rect(rect)
+        found = []
+        seen = set()
+        for cell in self._cells_in(self._cell_range(rect)):
+            for obj in self._cells.get(cell, ()):
+                if obj not in seen:
+                    seen.add(obj)
+                    if self._entries[obj][0].colliderect(rect):
+                        found.append(obj)
+        return found
+
+    def query_radius(self, center, radius):
+        """Returns the objects whose rect centre is within radius of center, nearest first."""
+        center_x, center_y = center
+        search = pygame.Rect(center_x - radius, center_y - radius, 0, 0)
+        search.size = (radius * 2 + 1, radius * 2 + 1)
+        in_range = []
+        for obj in self.query_rect(search):
+            obj_x, obj_y = self._entries[obj][0].center
+            distance_sq = (obj_x - center_x) ** 2 + (obj_y - center_y) ** 2
+            if distance_sq < radius * radius:
+                in_range.append((distance_sq, obj))
+        in_range.sort(key=lambda pair: pair[0])
+        return [obj for _, obj in in_range]
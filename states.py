@@ -2,7 +2,6 @@
 
 import copy
 import pygame
-import random
 import constants as C
 from factories import GENE_TEMPLATES, ITEM_TEMPLATES, VENDOR_INVENTORIES
 from gene import StatGene
@@ -11,8 +10,12 @@ from item import Consumable, Weapon
 from npc import NPC
 from gamemap import GameMap
 from combat import resolve_attack
+from rng import get_rng, rng
+from fonts import get_font
 from map_view import draw_map
+from overlays import get_overlay
 from room import Room
+from text_cache import render_text
 import json
 from ui_elements import (
     Button,
@@ -20,6 +23,7 @@ from ui_elements import (
     PauseMenu,
     ShopUI,
     TextBox,
+    CombatLog,
     DialogueBox,
     CharacterSheet,
     SettingsMenu,
@@ -37,11 +41,29 @@ class BaseState:
         self.done = False
         self.quit = False
         self.next_state = None
+        # Regions changed since the last presented frame, for dirty-rect rendering.
+        # None means the whole screen changed, an empty list means nothing did.
+        self.dirty_rects = None
 
     def handle_events(self, event):
         """Handle a single user event. Called for each event in the event queue."""
         if event.type == pygame.QUIT:
             self.quit = True
+        # Any input can change what's on screen (hover, typing, clicks, menus)
+        self.mark_dirty()
+
+    def mark_dirty(self, rect=None):
+        """Flags a region for redrawing. With no rect, the whole screen is flagged."""
+        if rect is None:
+            self.dirty_rects = None
+        elif self.dirty_rects is not None:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def take_dirty_rects(self):
+        """Returns the regions flagged since the last call and starts a fresh list."""
+        dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+        return dirty_rects
 
     def update(self, dt):
         pass
@@ -56,9 +78,9 @@ class CharCreationState(BaseState):
     def __init__(self, game, initial_data):
         super().__init__(game)
         self.data = initial_data
-        self.font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
-        self.font_header = pygame.font.Font(None, C.FONT_SIZE_HEADER)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE)
+        self.font_header = get_font(None, C.FONT_SIZE_HEADER)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
         self.temp_genome = {}
         for gene_id, gene in GENE_TEMPLATES.items():
             if isinstance(gene, StatGene):
@@ -93,6 +115,8 @@ class CharCreationState(BaseState):
 
             # Populate the shared game context
             self.context.player = player
+            # Every new game starts its own run ("seed" setting, or a fresh one)
+            rng.reseed(self.game.settings["seed"])
 
             self.done = True
             self.next_state = "TOWN"
@@ -135,17 +159,19 @@ class CharCreationState(BaseState):
     def draw(self, screen):
         screen.fill(C.ROOM_COLOR)
         # Titles
-        title_text = self.font_title.render("Create Your Legacy", True, C.WHITE)
+        title_text = render_text(self.font_title, "Create Your Legacy", True, C.WHITE)
         screen.blit(title_text, (C.INTERNAL_WIDTH / 2 - title_text.get_width() / 2, 20))
         # Name Section
-        screen.blit(self.font_header.render("First Name:", True, C.WHITE), (50, 50))
+        screen.blit(
+            render_text(self.font_header, "First Name:", True, C.WHITE), (50, 50)
+        )
         pygame.draw.rect(
             screen,
             C.GRAY,
             self.data["ui_elements"]["name_box"],
             2 if not self.data["name_active"] else 3,
         )
-        name_text = self.font_text.render(self.data["name"], True, C.WHITE)
+        name_text = render_text(self.font_text, self.data["name"], True, C.WHITE)
         screen.blit(
             name_text,
             (
@@ -154,14 +180,16 @@ class CharCreationState(BaseState):
             ),
         )
         # Family name Section
-        screen.blit(self.font_header.render("Family Name:", True, C.WHITE), (50, 130))
+        screen.blit(
+            render_text(self.font_header, "Family Name:", True, C.WHITE), (50, 130)
+        )
         pygame.draw.rect(
             screen,
             C.GRAY,
             self.data["ui_elements"]["family_name_box"],
             2 if not self.data["family_name_active"] else 3,
         )
-        name_text = self.font_text.render(self.data["family_name"], True, C.WHITE)
+        name_text = render_text(self.font_text, self.data["family_name"], True, C.WHITE)
         screen.blit(
             name_text,
             (
@@ -170,20 +198,23 @@ class CharCreationState(BaseState):
             ),
         )
         # Stats Section
-        points_text = self.font_header.render(
-            f"Attribute Points: {self.data['points_to_spend']}", True, C.WHITE
+        points_text = render_text(
+            self.font_header,
+            f"Attribute Points: {self.data['points_to_spend']}",
+            True,
+            C.WHITE,
         )
         screen.blit(points_text, (50, 240))
         for i, (stat_id, gene) in enumerate(self.temp_genome.items()):
             y_pos = 280 + i * 40
-            stat_text = self.font_text.render(
-                f"{gene.name}: {gene.value}", True, C.WHITE
+            stat_text = render_text(
+                self.font_text, f"{gene.name}: {gene.value}", True, C.WHITE
             )
             screen.blit(stat_text, (50, y_pos + 5))
             self.data["ui_elements"][f"{gene.gene_id}_plus"].draw(screen)
             self.data["ui_elements"][f"{gene.gene_id}_minus"].draw(screen)
         # Weapon Section
-        weapon_text = self.font_header.render("Choose a Weapon:", True, C.WHITE)
+        weapon_text = render_text(self.font_header, "Choose a Weapon:", True, C.WHITE)
         screen.blit(weapon_text, (450, 140))
         for i, weapon in enumerate(self.data["weapon_choices"]):
             rect = self.data["ui_elements"][f"weapon_{i}_rect"]
@@ -194,7 +225,7 @@ class CharCreationState(BaseState):
                 rect,
                 3 if is_selected else 2,
             )
-            weapon_name_text = self.font_text.render(weapon.name, True, C.WHITE)
+            weapon_name_text = render_text(self.font_text, weapon.name, True, C.WHITE)
             screen.blit(weapon_name_text, (rect.x + 10, rect.y + 12))
         # Done Button
         self.data["ui_elements"]["done_button"].draw(screen)
@@ -223,7 +254,26 @@ class GameplayState(BaseState):
         super().__init__(game)
         self.player = self.context.player
         self.game_map = self.context.game_map
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
+        # Where each tracked sprite was last presented, for dirty-rect rendering
+        self._sprite_rects = {}
+
+    def mark_sprites_dirty(self, sprites):
+        """Flags the old and new position of every sprite that moved, appeared or vanished."""
+        previous_rects = self._sprite_rects
+        current_rects = {}
+        for sprite in sprites:
+            rect = sprite.rect.copy()
+            current_rects[sprite] = rect
+            old_rect = previous_rects.pop(sprite, None)
+            if old_rect is None or old_rect != rect:
+                self.mark_dirty(rect)
+                if old_rect is not None:
+                    self.mark_dirty(old_rect)
+        # Whatever is left has been removed since the last frame
+        for old_rect in previous_rects.values():
+            self.mark_dirty(old_rect)
+        self._sprite_rects = current_rects
 
     def draw_hud(self, screen):
         """Draws the common Heads-Up Display."""
@@ -231,7 +281,8 @@ class GameplayState(BaseState):
         # Health
         health_color = C.GREEN if not self.player.is_defending else (100, 200, 255)
         screen.blit(
-            self.font_text.render(
+            render_text(
+                self.font_text,
                 f"Health: {self.player.health}/{self.player.max_health}",
                 True,
                 health_color,
@@ -240,7 +291,9 @@ class GameplayState(BaseState):
         )
         # Gold
         y_offset += 30
-        gold_text = self.font_text.render(f"Gold: {self.player.gold}", True, C.GOLD)
+        gold_text = render_text(
+            self.font_text, f"Gold: {self.player.gold}", True, C.GOLD
+        )
         screen.blit(gold_text, (20, y_offset))
 
 
@@ -303,39 +356,44 @@ class TownState(GameplayState):
                 self.game.push_state("CHAR_SHEET")
 
     def update(self, dt):
+        self.town_room.begin_tick()
         # --- Pause player movement and exits during dialogue ---
         if self.dialogue_box.is_active:
             return
 
         keys = pygame.key.get_pressed()
+        # PLAYER_SPEED is pixels per tick at the base rate
+        speed = C.PLAYER_SPEED * dt * C.BASE_TICK_RATE
         dx, dy = 0, 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx = -C.PLAYER_SPEED
+            dx = -speed
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx = C.PLAYER_SPEED
+            dx = speed
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy = -C.PLAYER_SPEED
+            dy = -speed
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy = C.PLAYER_SPEED
+            dy = speed
         if dx != 0 or dy != 0:
             self.player.move(dx, dy, C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)
 
         # --- Check for nearby NPCs instead of just collision ---
-        self.nearby_npc = None  # Reset each frame
-        for npc in self.town_room.npcs:
-            # Check distance between player and NPC centers
-            distance = pygame.math.Vector2(self.player.rect.center).distance_to(
-                npc.rect.center
-            )
-            if distance < C.NPC_INTERACTION_RADIUS:
-                self.nearby_npc = npc
-                break  # Found the closest one, no need to check others
+        nearby_npcs = self.town_room.npcs_near(
+            self.player.rect.center, C.NPC_INTERACTION_RADIUS
+        )
+        self.nearby_npc = nearby_npcs[0] if nearby_npcs else None  # The closest one
 
+        hint_before = (self.interaction_hint.is_visible, self.interaction_hint.text)
         if self.nearby_npc:
             self.interaction_hint.set_text(f"[E] Talk to {self.nearby_npc.name}")
             self.interaction_hint.is_visible = True
         else:
             self.interaction_hint.is_visible = False
+        if (
+            self.interaction_hint.is_visible,
+            self.interaction_hint.text,
+        ) != hint_before:
+            self.mark_dirty(self.interaction_hint.rect)
+        self.mark_sprites_dirty(self.town_room.all_sprites)
 
         exit_direction = None
         if self.player.rect.top <= 0:
@@ -355,7 +413,7 @@ class TownState(GameplayState):
 
     def draw(self, screen):
         screen.fill(C.ROOM_COLOR)
-        self.town_room.draw(screen)
+        self.town_room.draw(screen, self.game.render_alpha)
         self.draw_hud(screen)
         # Draw the UI elements
         for element in self.ui_elements:
@@ -386,23 +444,33 @@ class OverworldState(GameplayState):
             self.player_avatar.midright = (poi_rect.left - padding, poi_rect.centery)
         elif entry_direction == "EAST":
             self.player_avatar.midleft = (poi_rect.right + padding, poi_rect.centery)
+        # The avatar's exact position, since speeds scaled by dt aren't whole pixels
+        self.avatar_pos = pygame.math.Vector2(self.player_avatar.topleft)
 
     def handle_events(self, event):
         super().handle_events(event)
 
     def update(self, dt):
         keys = pygame.key.get_pressed()
+        # PLAYER_SPEED is pixels per tick at the base rate
+        speed = C.PLAYER_SPEED * dt * C.BASE_TICK_RATE
         dx, dy = 0, 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx = -C.PLAYER_SPEED
+            dx = -speed
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx = C.PLAYER_SPEED
+            dx = speed
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy = -C.PLAYER_SPEED
+            dy = -speed
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy = C.PLAYER_SPEED
+            dy = speed
         if dx != 0 or dy != 0:
-            self.player_avatar.move_ip(dx, dy)
+            self.mark_dirty(self.player_avatar)
+            self.avatar_pos += (dx, dy)
+            self.player_avatar.topleft = (
+                round(self.avatar_pos.x),
+                round(self.avatar_pos.y),
+            )
+            self.mark_dirty(self.player_avatar)
         # --- Dynamic entry direction logic ---
         for name, data in self.pois.items():
             if self.player_avatar.colliderect(data["rect"]):
@@ -441,7 +509,7 @@ class OverworldState(GameplayState):
         screen.fill((20, 80, 40))
         for name, data in self.pois.items():
             pygame.draw.rect(screen, C.GRAY, data["rect"])
-            name_text = self.font_text.render(name, True, C.WHITE)
+            name_text = render_text(self.font_text, name, True, C.WHITE)
             text_rect = name_text.get_rect(center=data["rect"].center)
             screen.blit(name_text, text_rect)
         pygame.draw.rect(screen, C.PLAYER_COLOR, self.player_avatar)
@@ -485,23 +553,45 @@ class ExploringState(GameplayState):
                 self.game.push_state("CHAR_SHEET")
 
     def update(self, dt):
+        self.current_room.begin_tick()
         if self.show_map:
             return
 
         keys = pygame.key.get_pressed()
+        # PLAYER_SPEED is pixels per tick at the base rate
+        speed = C.PLAYER_SPEED * dt * C.BASE_TICK_RATE
         dx, dy = 0, 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx = -C.PLAYER_SPEED
+            dx = -speed
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx = C.PLAYER_SPEED
+            dx = speed
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy = -C.PLAYER_SPEED
+            dy = -speed
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy = C.PLAYER_SPEED
+            dy = speed
         if dx != 0 or dy != 0:
             self.player.move(dx, dy, C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)
 
-        self.current_room.update(self.player)
+        scheduler = self.game.scheduler
+        self.current_room.update(self.player, dt, scheduler)
+
+        # The other rooms carry on at a lower level of detail, in whatever
+        # time the room's AI left over (and never more than their own budget).
+        # A scheduler counting items has no time to share out, so then the
+        # rooms are only capped by BACKGROUND_TICK_MAX_STEPS.
+        def update_background(game_map, step_dt):
+            budget_ms = None
+            if scheduler.budget_items is None:
+                budget_ms = min(scheduler.remaining_ms(), C.BACKGROUND_TICK_BUDGET_MS)
+            game_map.update_background(step_dt, budget_ms)
+
+        scheduler.submit(
+            "background_rooms",
+            [self.game_map],
+            update_background,
+            priority=C.PRIORITY_BACKGROUND_ROOMS,
+        )
+        scheduler.run(dt)
 
         if self.game_map.current_room_coords == (0, 0):
             exit_direction = self.game_map.entry_direction
@@ -547,11 +637,13 @@ class ExploringState(GameplayState):
             self.current_room.remove_player(self.player)
             self.current_room = new_room
             self.current_room.add_player(self.player)
+            # Its enemies moved while we were away, so don't interpolate from before
+            self.current_room.begin_tick()
             self.game_map.explored_rooms.add(self.game_map.current_room_coords)
+            self.mark_dirty()
+        self.mark_sprites_dirty(self.current_room.all_sprites)
 
-        collided_enemies = pygame.sprite.spritecollide(
-            self.player, self.current_room.enemies, False
-        )
+        collided_enemies = self.current_room.enemies_colliding_with(self.player.rect)
         if collided_enemies:
             self.context.active_enemy = collided_enemies[0]
             self.done = True
@@ -559,7 +651,7 @@ class ExploringState(GameplayState):
 
     def draw(self, screen):
         screen.fill(C.ROOM_COLOR)
-        self.current_room.draw(screen)
+        self.current_room.draw(screen, self.game.render_alpha)
         self.draw_hud(screen)
         if self.show_map:
             draw_map(screen, self.game_map)
@@ -570,14 +662,21 @@ class CombatState(GameplayState):
         super().__init__(game)
         self.current_room = self.game_map.get_current_room()
         self.active_enemy = self.context.active_enemy
-        self.combat_log = [f"You encounter a {self.active_enemy.name}!"]
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE)
+        self.combat_log = CombatLog((20, C.INTERNAL_HEIGHT - 150), self.font_text)
+        self.combat_log.append(f"You encounter a {self.active_enemy.name}!")
         self.current_turn = "PLAYER"
         self.phase = "ACTIVE"
         # For now we'll just set experience to gain equal to enemy health
         self.experience_to_gain = self.active_enemy.health
+        # Set while the enemy's turn is scheduled, so it's only queued once
+        self.enemy_turn_timer = None
 
     def handle_events(self, event):
         super().handle_events(event)
+        # Paging through the log isn't a combat action (or "any key" to leave)
+        if self.combat_log.handle_event(event):
+            return
         if self.phase == "VICTORY":
             if event.type == pygame.KEYDOWN:
                 self.done = True
@@ -610,7 +709,7 @@ class CombatState(GameplayState):
     def drop_chance(self, drop_list: list[dict], template_data):
         """Determines if something drops based on its drop chance."""
         for item in drop_list:
-            random_chance = random.random()
+            random_chance = get_rng("loot").random()
             if random_chance < item["drop_chance"]:
                 self.player.inventory.append(template_data[item["item_id"]])
                 self.combat_log.append(
@@ -622,6 +721,7 @@ class CombatState(GameplayState):
         if self.phase == "VICTORY":
             return
         if self.player.health <= 0:
+            self.mark_dirty()
             self.combat_log.append("You have been defeated!")
             self.done = True
             self.next_state = "GAME_OVER"
@@ -629,7 +729,8 @@ class CombatState(GameplayState):
         if self.active_enemy.health <= 0:
             # Switch to victory phase instead of ending the state
             self.phase = "VICTORY"
-            gold_to_add = random.randint(*self.active_enemy.gold_drop_range)
+            self.mark_dirty()
+            gold_to_add = get_rng("loot").randint(*self.active_enemy.gold_drop_range)
             # --- Check for "Avaricious" trait ---
             if self.player.has_trait("avaricious"):
                 avaricious_bonus = self.player.genome["avaricious"].effects[
@@ -647,65 +748,62 @@ class CombatState(GameplayState):
             self.active_enemy.kill()
             if self.current_room.enemies.__len__() == 0:
                 # If no enemies left, give more gold for clearing the room
-                extra_gold = random.randint(10, 30)
+                extra_gold = get_rng("loot").randint(10, 30)
                 self.player.gold += extra_gold
                 self.combat_log.append(
                     f"You clear the room and find an additional {extra_gold} gold!"
                 )
             return
-        if self.current_turn == "ENEMY":
-            pygame.time.wait(C.COMBAT_ENEMY_TURN_DELAY)
-            if self.active_enemy.is_charging_attack:
-                attack_result = resolve_attack(
-                    self.active_enemy, self.player, "vicious_bite"
-                )
-                self.active_enemy.is_charging_attack = False
+        if self.current_turn == "ENEMY" and self.enemy_turn_timer is None:
+            self.mark_dirty()
+            # Pause before the enemy acts, without holding up the game loop
+            self.enemy_turn_timer = self.game.timers.after(
+                C.COMBAT_ENEMY_TURN_DELAY / 1000, self.take_enemy_turn, owner=self
+            )
+
+    def take_enemy_turn(self):
+        """The enemy attacks, or starts charging its vicious bite."""
+        self.enemy_turn_timer = None
+        self.mark_dirty()
+        if self.active_enemy.is_charging_attack:
+            attack_result = resolve_attack(
+                self.active_enemy, self.player, "vicious_bite"
+            )
+            self.active_enemy.is_charging_attack = False
+        else:
+            if get_rng("combat").randint(1, 100) <= 90:
+                attack_result = resolve_attack(self.active_enemy, self.player, "normal")
             else:
-                if random.randint(1, 100) <= 90:
-                    attack_result = resolve_attack(
-                        self.active_enemy, self.player, "normal"
-                    )
-                else:
-                    self.active_enemy.is_charging_attack = True
-                    attack_result = {
-                        "damage": 0,
-                        "message": f"The {self.active_enemy.name} growls, preparing a vicious bite!",
-                    }
-            damage_taken = attack_result["damage"]
-            if self.player.is_defending:
-                base_reduction = 0.5  # 50%
-                # --- Check for "Cautious" trait ---
-                if self.player.has_trait("cautious"):
-                    cautious_bonus = self.player.genome["cautious"].effects[
-                        "defend_damage_reduction"
-                    ]
-                    base_reduction += cautious_bonus
-
-                damage_taken = int(damage_taken * (1 - base_reduction))
-                attack_result["message"] += f" (Blocked {int(base_reduction * 100)}%!)"
-                self.player.is_defending = False
-            self.combat_log.append(attack_result["message"])
-            self.player.health = max(0, self.player.health - damage_taken)
-            if not self.active_enemy.is_charging_attack:
-                self.current_turn = "PLAYER"
+                self.active_enemy.is_charging_attack = True
+                attack_result = {
+                    "damage": 0,
+                    "message": f"The {self.active_enemy.name} growls, preparing a vicious bite!",
+                }
+        damage_taken = attack_result["damage"]
+        if self.player.is_defending:
+            # 50%, more with the "Cautious" trait
+            base_reduction = self.player.combat_profile.defend_reduction
+            damage_taken = int(damage_taken * (1 - base_reduction))
+            attack_result["message"] += f" (Blocked {int(base_reduction * 100)}%!)"
+            self.player.is_defending = False
+        self.combat_log.append(attack_result["message"])
+        self.player.health = max(0, self.player.health - damage_taken)
+        if not self.active_enemy.is_charging_attack:
+            self.current_turn = "PLAYER"
 
     def draw(self, screen):
         # Draw the exploring view first as a background
         screen.fill(C.ROOM_COLOR)
         self.current_room.draw(screen)
         # Draw combat overlay
-        overlay = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        screen.blit(get_overlay(screen.get_size(), (0, 0, 0, 180)), (0, 0))
         # Draw HUD (player and enemy stats)
         self.draw_hud(screen)
 
-        # We need a font for the VICTORY text
-        font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
-
         # Only show the enemy health if they are still active
         if self.phase == "ACTIVE":
-            enemy_health_text = self.font_text.render(
+            enemy_health_text = render_text(
+                self.font_text,
                 f"{self.active_enemy.name} Health: {self.active_enemy.health}",
                 True,
                 C.RED,
@@ -713,14 +811,7 @@ class CombatState(GameplayState):
             screen.blit(enemy_health_text, (C.INTERNAL_WIDTH - 250, 20))
 
         # Combat Log (Bottom-Left)
-        log_start_x = 20
-        log_start_y = C.INTERNAL_HEIGHT - 150
-        line_height = 30
-        messages_to_draw = self.combat_log[-4:]
-        for i, message in enumerate(messages_to_draw):
-            y_pos = log_start_y + i * line_height
-            log_text = self.font_text.render(message, True, C.WHITE)
-            screen.blit(log_text, (log_start_x, y_pos))
+        self.combat_log.draw(screen)
 
         # Action Menu (Bottom-Right) - only if combat is active
         if self.phase == "ACTIVE" and self.current_turn == "PLAYER":
@@ -728,16 +819,16 @@ class CombatState(GameplayState):
             menu_y = C.INTERNAL_HEIGHT - 120
             actions = ["[1] Attack", "[2] Power Attack", "[3] Defend"]
             for i, action in enumerate(actions):
-                action_text = self.font_text.render(action, True, C.WHITE)
+                action_text = render_text(self.font_text, action, True, C.WHITE)
                 screen.blit(action_text, (menu_x, menu_y + i * 30))
         if self.phase == "VICTORY":
-            victory_text = font_title.render("VICTORY", True, C.GOLD)
+            victory_text = render_text(self.font_title, "VICTORY", True, C.GOLD)
             text_rect = victory_text.get_rect(
                 center=(C.INTERNAL_WIDTH / 2, C.INTERNAL_HEIGHT / 2 - 50)
             )
             screen.blit(victory_text, text_rect)
-            continue_text = self.font_text.render(
-                "Press any key to continue...", True, C.WHITE
+            continue_text = render_text(
+                self.font_text, "Press any key to continue...", True, C.WHITE
             )
             continue_rect = continue_text.get_rect(
                 center=(C.INTERNAL_WIDTH / 2, C.INTERNAL_HEIGHT / 2 + 10)
@@ -748,8 +839,8 @@ class CombatState(GameplayState):
 class GameOverState(GameplayState):
     def __init__(self, game):
         super().__init__(game)
-        self.font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
 
     def handle_events(self, event):
         super().handle_events(event)
@@ -760,12 +851,12 @@ class GameOverState(GameplayState):
 
     def draw(self, screen):
         # Draw a dark overlay, similar to combat
-        overlay = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 220))
-        screen.blit(overlay, (0, 0))
+        screen.blit(get_overlay(screen.get_size(), (0, 0, 0, 220)), (0, 0))
 
         # Display Game Over text
-        title_text = self.font_title.render("Your Legacy Ends Here", True, C.WHITE)
+        title_text = render_text(
+            self.font_title, "Your Legacy Ends Here", True, C.WHITE
+        )
         title_rect = title_text.get_rect(
             center=(C.INTERNAL_WIDTH / 2, C.INTERNAL_HEIGHT / 2 - 50)
         )
@@ -773,15 +864,15 @@ class GameOverState(GameplayState):
 
         # Display the fallen hero's name
         hero_name = f"'{self.player.first_name} {self.player.family_name}' has fallen."
-        name_text = self.font_text.render(hero_name, True, C.GRAY)
+        name_text = render_text(self.font_text, hero_name, True, C.GRAY)
         name_rect = name_text.get_rect(
             center=(C.INTERNAL_WIDTH / 2, C.INTERNAL_HEIGHT / 2 + 10)
         )
         screen.blit(name_text, name_rect)
 
         # Display instruction to restart
-        instr_text = self.font_text.render(
-            "Press any key to begin a new legacy.", True, C.WHITE
+        instr_text = render_text(
+            self.font_text, "Press any key to begin a new legacy.", True, C.WHITE
         )
         instr_rect = instr_text.get_rect(
             center=(C.INTERNAL_WIDTH / 2, C.INTERNAL_HEIGHT - 100)
@@ -789,10 +880,41 @@ class GameOverState(GameplayState):
         screen.blit(instr_text, instr_rect)
 
 
-class CharacterSheetState(GameplayState):
+class ModalState(GameplayState):
+    """
+    Base class for states drawn on top of the state below them on the stack.
+    The state underneath is rendered once into a frozen, already darkened
+    snapshot when the modal is pushed, and the modal draws over that snapshot
+    until it is popped instead of re-rendering the whole scene every frame.
+    """
+
+    # RGBA tint baked into the snapshot, or None to leave it undimmed
+    background_tint = None
+
     def __init__(self, game):
         super().__init__(game)
         self.previous_state = game.state_stack[-1]
+        self.background = pygame.Surface(
+            (C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)
+        ).convert()
+        self.refresh_background()
+
+    def refresh_background(self):
+        """Re-captures the state underneath, e.g. after the modal changed the HUD."""
+        self.previous_state.draw(self.background)
+        if self.background_tint:
+            self.background.blit(
+                get_overlay(self.background.get_size(), self.background_tint), (0, 0)
+            )
+        self.mark_dirty()
+
+    def draw(self, screen):
+        screen.blit(self.background, (0, 0))
+
+
+class CharacterSheetState(ModalState):
+    def __init__(self, game):
+        super().__init__(game)
         self.sheet_ui = CharacterSheet(game)  # Pass the whole game object
 
     def handle_events(self, event):
@@ -803,7 +925,7 @@ class CharacterSheetState(GameplayState):
                 self.game.pop_state()
 
     def draw(self, screen):
-        self.previous_state.draw(screen)
+        super().draw(screen)
         self.sheet_ui.draw(screen)
 
     def use_item(self, item_index):
@@ -813,6 +935,9 @@ class CharacterSheetState(GameplayState):
                 was_used = item.use(self.player)
                 if was_used:
                     self.player.inventory.pop(item_index)
+                    self.sheet_ui.invalidate()
+                    # Healing changes the HUD frozen in the background
+                    self.refresh_background()
 
     def equip_item(self, item_index):
         if 0 <= item_index < len(self.player.inventory):
@@ -824,12 +949,14 @@ class CharacterSheetState(GameplayState):
 
                 self.player.equipped_weapon = item
                 self.player.inventory.pop(item_index)
+                self.sheet_ui.invalidate()
 
 
-class PauseState(GameplayState):
+class PauseState(ModalState):
+    background_tint = (0, 0, 0, 180)
+
     def __init__(self, game):
         super().__init__(game)
-        self.previous_state = game.state_stack[-1]
         self.menu_ui = PauseMenu(game)
 
     def handle_events(self, event):
@@ -840,18 +967,19 @@ class PauseState(GameplayState):
                 self.game.pop_state()
 
     def draw(self, screen):
-        # Draw the state below it as the background, then the menu on top
-        self.previous_state.draw(screen)
+        # Draw the frozen state below it as the background, then the menu on top
+        super().draw(screen)
         self.menu_ui.draw(screen)
 
 
-class ShopState(GameplayState):
+class ShopState(ModalState):
     """A state for interacting with a vendor."""
 
+    background_tint = (0, 0, 0, 200)
+
     def __init__(self, game, vendor):
         super().__init__(game)
         self.vendor = vendor
-        self.previous_state = game.state_stack[-1]
 
         # Populate vendor's inventory if it's empty
         if not self.vendor.inventory and self.vendor.vendor_id:
@@ -876,6 +1004,8 @@ class ShopState(GameplayState):
             self.player.gold -= item.value
             self.player.inventory.append(item)
             self.vendor.inventory.pop(item_index)
+            self.shop_ui.invalidate()
+            self.refresh_background()  # The gold in the HUD changed
             print(f"Bought {item.name}")
 
     def sell_item(self, item_index):
@@ -885,19 +1015,22 @@ class ShopState(GameplayState):
         self.player.gold += sell_price
         self.vendor.inventory.append(item)
         self.player.inventory.pop(item_index)
+        self.shop_ui.invalidate()
+        self.refresh_background()  # The gold in the HUD changed
         print(f"Sold {item.name}")
 
     def draw(self, screen):
-        self.previous_state.draw(screen)
+        super().draw(screen)
         self.shop_ui.draw(screen)
 
 
-class SettingsState(GameplayState):
+class SettingsState(ModalState):
     """A state for managing game settings."""
 
+    background_tint = (0, 0, 0, 220)
+
     def __init__(self, game):
         super().__init__(game)
-        self.previous_state = game.state_stack[-1]
         self.settings_ui = SettingsMenu(game)
 
     def handle_events(self, event):
@@ -908,7 +1041,7 @@ class SettingsState(GameplayState):
                 self.game.pop_state()
 
     def draw(self, screen):
-        self.previous_state.draw(screen)
+        super().draw(screen)
         self.settings_ui.draw(screen)
 
 
@@ -0,0 +1,73 @@
+# text_cache.py
+from collections import OrderedDict
+import constants as C
+
+
+class TextCache:
+    """
+    A bounded least-recently-used cache of rendered text surfaces.
+    Rendering the same string with the same font and color every frame is
+    wasteful, so each distinct (font, text, antialias, color) is rendered
+    once and the surface is reused until it falls out of the cache.
+    Labels that change every frame (a ticking counter) just cycle through
+    the oldest entries.
+    """
+
+    def __init__(self, max_entries=C.TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        """Drop-in replacement for font.render(text, antialias, color)."""
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # Drop the least recently used entry
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Drops every cached surface and resets the counters."""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hit_rate(self):
+        """Returns the fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Lookups served, renders and evictions. Many evictions against a full
+        cache mean TEXT_CACHE_SIZE is too small for the screen being drawn.
+        """
+        return {
+            "entries": len(self._surfaces),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate(),
+        }
+
+
+# Bounded, so dynamic strings like gold counts can't grow it without limit
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Renders text through the global cache. Use in place of font.render."""
+    return text_cache.render(font, text, antialias, color)
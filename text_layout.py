@@ -0,0 +1,158 @@
+# text_layout.py
+from collections import OrderedDict
+import weakref
+import constants as C
+
+# How far a summed width may be off from the real width, per word joined.
+# Kerning across the space pulls a line in by up to 3 pixels per join in
+# the UI fonts (more at the bigger sizes), rounding can push it out by 1.
+WIDTH_SLACK_PER_WORD = 3
+
+
+class FontMetrics:
+    """
+    Remembers how wide each word is in one font, so wrapping a paragraph
+    measures every distinct word once instead of re-measuring the whole
+    growing line for each word.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.space_width = font.size(" ")[0]
+        self._word_widths = {}
+
+    def word_width(self, word):
+        width = self._word_widths.get(word)
+        if width is None:
+            width = self.font.size(word)[0]
+            self._word_widths[word] = width
+        return width
+
+
+# One width table per font, dropped along with the font
+_metrics = weakref.WeakKeyDictionary()
+
+
+def get_metrics(font):
+    """Returns the shared FontMetrics for a font, creating it on first use."""
+    metrics = _metrics.get(font)
+    if metrics is None:
+        metrics = FontMetrics(font)
+        _metrics[font] = metrics
+    return metrics
+
+
+def wrap_text(text, font, max_width):
+    """
+    Wraps text to a specific width.
+
+    Line widths are estimated from the cached word widths. The sum can be
+    a few pixels off the real width either way (kerning across the spaces
+    and rounding), so whenever the estimate lands within that margin of the
+    limit the whole line is measured with font.size instead. Line breaks
+    are the same as measuring every candidate line.
+    """
+    metrics = get_metrics(font)
+    lines = []
+    current_words = []
+    current_width = 0
+
+    for word in text.split(" "):
+        if not word:
+            continue  # Repeated spaces collapse, as they always have
+        word_width = metrics.word_width(word)
+        if not current_words:
+            current_words.append(word)
+            current_width = word_width
+            continue
+
+        estimate = current_width + metrics.space_width + word_width
+        if abs(estimate - max_width) <= WIDTH_SLACK_PER_WORD * len(current_words):
+            # Too close to call from the estimate alone
+            fits = font.size(" ".join(current_words + [word]))[0] <= max_width
+        else:
+            fits = estimate <= max_width
+        if fits:
+            current_words.append(word)
+            current_width = estimate
+        else:
+            lines.append(" ".join(current_words))
+            current_words = [word]
+            current_width = word_width
+    lines.append(" ".join(current_words))
+    return lines
+
+
+class TextLayout:
+    """A block of text wrapped to a width, with each line already rendered."""
+
+    def __init__(self, lines, surfaces, line_height):
+        self.lines = lines
+        self.surfaces = surfaces
+        self.line_height = line_height
+
+    def draw(self, screen, pos, line_spacing=None):
+        """Blits every line, starting at pos. Returns the rects that were drawn."""
+        step = line_spacing if line_spacing is not None else self.line_height
+        x, y = pos
+        return [
+            screen.blit(surface, (x, y + i * step))
+            for i, surface in enumerate(self.surfaces)
+        ]
+
+
+class TextLayoutCache:
+    """
+    A bounded least-recently-used cache of wrapped, rendered text blocks
+    keyed by (text, font, width, color). A dialogue node or description is
+    laid out once when it first appears and then drawn from the cache on
+    every following frame. Asking again for the same text returns the same
+    TextLayout object, so its lines and surfaces must not be changed.
+    """
+
+    def __init__(self, max_entries=C.TEXT_LAYOUT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def layout(self, text, font, max_width, color=C.WHITE, antialias=True):
+        key = (text, font, max_width, tuple(color), antialias)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self.hits += 1
+            self._layouts.move_to_end(key)
+            return layout
+
+        self.misses += 1
+        lines = wrap_text(text, font, max_width)
+        surfaces = [font.render(line, antialias, color) for line in lines]
+        layout = TextLayout(lines, surfaces, font.get_linesize())
+        self._layouts[key] = layout
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)  # Drop the least recently used entry
+        return layout
+
+    def clear(self):
+        self._layouts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Layouts held, and how often a block of text was found already wrapped."""
+        return {
+            "entries": len(self._layouts),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Keyed by width as well as text, so a resized dialogue box lays its text
+# out again instead of reusing the old line breaks
+text_layout_cache = TextLayoutCache()
+
+
+def layout_text(text, font, max_width, color=C.WHITE, antialias=True):
+    """Wraps and renders text through the global cache."""
+    return text_layout_cache.layout(text, font, max_width, color, antialias)
@@ -0,0 +1,126 @@
+# timers.py
+
+
+def linear(t):
+    return t
+
+
+def ease_out_quad(t):
+    return 1 - (1 - t) * (1 - t)
+
+
+class Timer:
+    """A callback waiting to run after a delay (see TimerManager.after)."""
+
+    def __init__(self, delay, callback, owner=None, repeat=False):
+        self.delay = delay
+        self.callback = callback
+        self.owner = owner
+        self.repeat = repeat
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    def advance(self, dt):
+        """Moves the timer on by dt seconds. Returns True once it is finished."""
+        self.elapsed += dt
+        if self.elapsed < self.delay:
+            return False
+        self.callback()
+        if self.repeat and not self.cancelled:
+            self.elapsed -= self.delay
+            return False
+        return True
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Tween(Timer):
+    """Moves an attribute from its current value to a target over a duration."""
+
+    def __init__(
+        self, target, attribute, end, duration, owner=None, easing=linear, on_done=None
+    ):
+        super().__init__(duration, on_done or (lambda: None), owner)
+        self.target = target
+        self.attribute = attribute
+        self.start = getattr(target, attribute)
+        self.end = end
+        self.easing = easing
+
+    def advance(self, dt):
+        self.elapsed += dt
+        t = min(self.elapsed / self.delay, 1.0) if self.delay > 0 else 1.0
+        progress = self.easing(t)
+        setattr(
+            self.target, self.attribute, self.start + (self.end - self.start) * progress
+        )
+        if t < 1.0:
+            return False
+        self.callback()
+        return True
+
+
+class TimerManager:
+    """
+    Delayed callbacks and tweens, advanced by the game's simulation ticks.
+
+    Nothing blocks: a state that wants something to happen later schedules
+    it here and the game keeps running, drawing and handling input in the
+    meantime. Timers can belong to an owner, usually a state. Owned timers
+    only advance while their owner is the active state, so a pause menu on
+    top freezes them, and cancel_owner() drops them all when the state goes
+    away. Timers without an owner always advance.
+    """
+
+    def __init__(self):
+        self._timers = []
+
+    def after(self, delay, callback, owner=None, repeat=False):
+        """Calls callback once after delay seconds (or every delay seconds if repeat)."""
+        timer = Timer(delay, callback, owner, repeat)
+        self._timers.append(timer)
+        return timer
+
+    def tween(
+        self, target, attribute, end, duration, owner=None, easing=linear, on_done=None
+    ):
+        """Animates target.attribute to end over duration seconds."""
+        tween = Tween(target, attribute, end, duration, owner, easing, on_done)
+        self._timers.append(tween)
+        return tween
+
+    def cancel_owner(self, owner):
+        """Cancels every timer and tween that belongs to owner."""
+        for timer in self._timers:
+            if timer.owner is owner:
+                timer.cancel()
+
+    def pending(self, owner=None):
+        """Returns how many timers are waiting, optionally only those of one owner."""
+        return sum(
+            1
+            for timer in self._timers
+            if not timer.cancelled and (owner is None or timer.owner is owner)
+        )
+
+    def update(self, dt, active_owner=None):
+        """Advances the timers of active_owner and those without an owner."""
+        if not self._timers:
+            return
+        # Callbacks may schedule new timers, which start on the next tick
+        timers = self._timers
+        self._timers = []
+        still_running = []
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            if timer.owner is not None and timer.owner is not active_owner:
+                still_running.append(timer)
+                continue
+            if not timer.advance(dt) and not timer.cancelled:
+                still_running.append(timer)
+        self._timers = still_running + self._timers
+
+    def clear(self):
+        self._timers.clear()
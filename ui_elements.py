@@ -2,25 +2,16 @@
 import pygame
 import constants as C
 import os
+from collections import deque
+from itertools import islice
 
+from fonts import get_font
 from item import Consumable, Weapon
+from spatial import SpatialHash
+from text_cache import render_text
 
-
-def wrap_text(text, font, max_width):
-    """Wraps text to a specific width."""
-    words = text.split(" ")
-    lines = []
-    current_line = ""
-
-    for word in words:
-        test_line = f"{current_line} {word}".strip()
-        if font.size(test_line)[0] <= max_width:
-            current_line = test_line
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
-    return lines
+# wrap_text moved to text_layout; it is still importable from here
+from text_layout import layout_text, wrap_text
 
 
 class UIElement:
@@ -54,20 +45,28 @@ class Button(UIElement):
         self.enabled_color = enabled_color
         self.disabled_color = disabled_color
         self.is_disabled = False
+        # The finished button image, rebuilt only when its text or state changes
+        self._surface = None
+        self._surface_key = None
+
+    def _get_surface(self):
+        surface_key = (self.text, self.is_disabled)
+        if surface_key != self._surface_key:
+            # Determine color based on state
+            color = self.enabled_color if not self.is_disabled else self.disabled_color
+            self._surface = pygame.Surface(self.rect.size).convert()
+            self._surface.fill(color)
+
+            # Render and center the text
+            text_surface = render_text(self.font, self.text, True, C.BLACK)
+            text_rect = text_surface.get_rect(center=self._surface.get_rect().center)
+            self._surface.blit(text_surface, text_rect)
+            self._surface_key = surface_key
+        return self._surface
 
     def draw(self, screen):
         """Draws the button on the screen."""
-        # Determine color based on state
-        color = self.enabled_color if not self.is_disabled else self.disabled_color
-
-        # Draw the button rectangle
-        pygame.draw.rect(screen, color, self.rect)
-
-        # Render and center the text
-        text_surface = self.font.render(self.text, True, C.BLACK)  # Black text
-        text_rect = text_surface.get_rect(center=self.rect.center)
-
-        screen.blit(text_surface, text_rect)
+        screen.blit(self._get_surface(), self.rect)
 
     def handle_event(self, event):
         """Checks if the button was clicked."""
@@ -98,19 +97,188 @@ class TextBox(UIElement):
         if self.bg_color:
             pygame.draw.rect(screen, self.bg_color, self.rect)
 
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = render_text(self.font, self.text, True, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 
+class Label(UIElement):
+    """A single line of static text whose rendered surface is kept between frames."""
+
+    def __init__(self, text, pos, font, color=C.WHITE):
+        self.text = text
+        self.font = font
+        self.color = color
+        self.surface = render_text(font, text, True, color)
+        super().__init__(self.surface.get_rect(topleft=pos))
+
+    def set_color(self, color):
+        if color != self.color:
+            self.color = color
+            self.surface = render_text(self.font, self.text, True, color)
+
+    def draw(self, screen):
+        if self.is_visible:
+            screen.blit(self.surface, self.rect)
+
+
+class CombatLog(UIElement):
+    """
+    A scrolling log of combat messages.
+
+    Only the newest `capacity` messages are kept, in a deque, so a long
+    fight doesn't grow memory. Each message is rendered once, when it is
+    added, and drawing just blits the few lines on screen. Page Up/Down or
+    the mouse wheel scroll back through older messages. Every message can
+    also be written to an export stream (any object with write()) as it
+    comes in, which keeps the full log even after old lines drop out.
+    """
+
+    def __init__(
+        self,
+        pos,
+        font,
+        visible_lines=C.COMBAT_LOG_VISIBLE_LINES,
+        capacity=C.COMBAT_LOG_CAPACITY,
+        line_height=30,
+        color=C.WHITE,
+        export_stream=None,
+    ):
+        rect = pygame.Rect(pos, (0, visible_lines * line_height))
+        super().__init__(rect)
+        self.font = font
+        self.visible_lines = visible_lines
+        self.line_height = line_height
+        self.color = color
+        self.export_stream = export_stream
+        self.entries = deque(maxlen=capacity)  # (message, rendered surface)
+        self.scroll = 0  # How many lines the view is scrolled back from the newest
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, message):
+        """Adds a message, rendering it now so drawing never has to."""
+        # Rendered directly rather than through the shared text cache: the
+        # log owns these surfaces, and one-off messages would only evict
+        # the cache's reusable labels
+        self.entries.append((message, self.font.render(message, True, self.color)))
+        if self.scroll:
+            # Keep showing the same lines while the player reads back
+            self.scroll = min(self.scroll + 1, self.max_scroll())
+        if self.export_stream is not None:
+            self.export_stream.write(message + "\n")
+
+    def messages(self):
+        """Returns the messages still held, oldest first."""
+        return [message for message, _ in self.entries]
+
+    def export(self, stream):
+        """Writes the messages still held to a stream, one per line."""
+        for message, _ in self.entries:
+            stream.write(message + "\n")
+
+    def max_scroll(self):
+        return max(0, len(self.entries) - self.visible_lines)
+
+    def scroll_by(self, lines):
+        """Scrolls back (positive) or forward (negative). Returns True if the view moved."""
+        new_scroll = min(max(self.scroll + lines, 0), self.max_scroll())
+        moved = new_scroll != self.scroll
+        self.scroll = new_scroll
+        return moved
+
+    def handle_event(self, event):
+        """Pages through the log. Returns True if the event scrolled it."""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_PAGEUP:
+                self.scroll_by(self.visible_lines)
+                return True
+            if event.key == pygame.K_PAGEDOWN:
+                self.scroll_by(-self.visible_lines)
+                return True
+        elif event.type == pygame.MOUSEWHEEL:
+            return self.scroll_by(event.y)
+        return False
+
+    def visible_entries(self):
+        """The entries on screen, oldest first. Only walks the lines it returns."""
+        newest_first = islice(
+            reversed(self.entries), self.scroll, self.scroll + self.visible_lines
+        )
+        return list(newest_first)[::-1]
+
+    def draw(self, screen):
+        if not self.is_visible:
+            return
+        for i, (_, surface) in enumerate(self.visible_entries()):
+            screen.blit(surface, (self.rect.x, self.rect.y + i * self.line_height))
+
+
+class WidgetLayer:
+    """
+    A retained collection of widgets. The widgets are built once by a build
+    function and kept until invalidate() is called, instead of being
+    recreated every frame. Clicks are routed through a spatial index, so
+    only the widgets under the cursor are hit-tested.
+    """
+
+    def __init__(self, build_widgets):
+        self._build_widgets = build_widgets
+        self.widgets = []
+        self._callbacks = {}
+        self._index = SpatialHash()
+        self.is_valid = False
+        self.builds = 0
+
+    def invalidate(self):
+        """Marks the widgets as stale, so they are rebuilt before next use."""
+        self.is_valid = False
+
+    def add(self, widget, on_click=None):
+        """Adds a widget. If on_click is given, the widget is clickable."""
+        self.widgets.append(widget)
+        if on_click:
+            self._callbacks[widget] = on_click
+            self._index.insert(widget, widget.rect)
+        return widget
+
+    def ensure_built(self):
+        if self.is_valid:
+            return
+        self.widgets = []
+        self._callbacks = {}
+        self._index.clear()
+        self._build_widgets(self)
+        self.is_valid = True
+        self.builds += 1
+
+    def handle_event(self, event):
+        """Runs the callback of the clicked widget. Returns True if one ran."""
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1:
+            return False
+        self.ensure_built()
+        for widget in self._index.query_point(event.pos):
+            # Let the widget decide, so disabled buttons ignore the click
+            if widget.handle_event(event) is not False:
+                self._callbacks[widget]()
+                return True
+        return False
+
+    def draw(self, screen):
+        self.ensure_built()
+        for widget in self.widgets:
+            widget.draw(screen)
+
+
 class DialogueBox(UIElement):
     """A UI element for displaying branching conversations with keyboard and mouse support."""
 
     def __init__(self):
         rect = pygame.Rect(C.DIALOGUE_BOX_RECT)
         super().__init__(rect)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
-        self.font_speaker = pygame.font.Font(None, C.FONT_SIZE_HEADER)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
+        self.font_speaker = get_font(None, C.FONT_SIZE_HEADER)
 
         self.is_active = False
         self.speaker_name = ""
@@ -185,18 +353,17 @@ class DialogueBox(UIElement):
         pygame.draw.rect(screen, C.WHITE, self.rect, 2)
 
         # Draw the speaker's name
-        speaker_surf = self.font_speaker.render(
-            f"{self.speaker_name}:", True, (200, 200, 100)
+        speaker_surf = render_text(
+            self.font_speaker, f"{self.speaker_name}:", True, (200, 200, 100)
         )
         screen.blit(speaker_surf, (self.rect.x + 15, self.rect.y + 10))
 
         # --- NEW: Text Wrapping for main dialogue text ---
-        wrapped_lines = wrap_text(
-            current_node["text"], self.font_text, self.rect.width - 40
+        # The wrapped lines are laid out once per node and reused every frame
+        dialogue_layout = layout_text(
+            current_node["text"], self.font_text, self.rect.width - 40, C.WHITE
         )
-        for i, line in enumerate(wrapped_lines):
-            dialogue_surf = self.font_text.render(line, True, C.WHITE)
-            screen.blit(dialogue_surf, (self.rect.x + 20, self.rect.y + 45 + i * 25))
+        dialogue_layout.draw(screen, (self.rect.x + 20, self.rect.y + 45), 25)
 
         # --- NEW: Mouse Hover and Keyboard Selection for choices ---
         self.choice_rects = []
@@ -216,7 +383,7 @@ class DialogueBox(UIElement):
             )
 
             choice_text = f"{choice['text']}"  # Removed numbering for a cleaner look
-            choice_surf = self.font_text.render(choice_text, True, color)
+            choice_surf = render_text(self.font_text, choice_text, True, color)
             choice_pos = (self.rect.x + 30, choice_y_start + i * 25)
 
             # We store the actual rendered rect for click detection
@@ -232,11 +399,11 @@ class CharacterSheet(UIElement):
         super().__init__(rect)
         self.game = game
         self.player = game.context.player
-        self.font_header = pygame.font.Font(None, C.FONT_SIZE_HEADER)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
+        self.font_header = get_font(None, C.FONT_SIZE_HEADER)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
 
         self.selected_item_idx = 0
-        self.inventory_rects = []
+        self.inventory_rows = []
         self.equip_button = Button(
             self.rect.x + 300,
             self.rect.bottom - 60,
@@ -257,140 +424,161 @@ class CharacterSheet(UIElement):
             C.BLUE,
             C.GRAY,
         )
+        # Everything on the sheet is built once and kept until the player changes
+        self.widgets = WidgetLayer(self._build_widgets)
 
-    def handle_event(self, event):
-        # Handle button clicks
-        if self.equip_button.handle_event(event):
-            self.game.get_active_state().equip_item(self.selected_item_idx)
-        if self.use_button.handle_event(event):
-            self.game.get_active_state().use_item(self.selected_item_idx)
-
-        # Handle keyboard navigation for inventory
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-                self.selected_item_idx = max(0, self.selected_item_idx - 1)
-            elif event.key == pygame.K_DOWN:
-                self.selected_item_idx = min(
-                    len(self.player.inventory) - 1, self.selected_item_idx + 1
-                )
-
-    def draw(self, screen):
-        # Draw background panel
-        pygame.draw.rect(screen, (30, 30, 40, 230), self.rect)
-        pygame.draw.rect(screen, C.WHITE, self.rect, 2)
+    def invalidate(self):
+        """Rebuilds the sheet on the next frame, e.g. after the inventory changed."""
+        self.widgets.invalidate()
 
+    def _build_widgets(self, layer):
         # Name
-        name_text = self.font_header.render(
-            f"{self.player.first_name} {self.player.family_name}", True, C.WHITE
+        layer.add(
+            Label(
+                f"{self.player.first_name} {self.player.family_name}",
+                (self.rect.x + 20, self.rect.y + 20),
+                self.font_header,
+            )
         )
-        screen.blit(name_text, (self.rect.x + 20, self.rect.y + 20))
 
         # Attributes Section (Left Column)
         y_offset = self.rect.y + 80
-        stats_header = self.font_header.render("Attributes", True, C.WHITE)
-        screen.blit(stats_header, (self.rect.x + 20, y_offset))
+        layer.add(Label("Attributes", (self.rect.x + 20, y_offset), self.font_header))
         stat_genes = self.player.get_stat_genes()
         for i, gene in enumerate(stat_genes):
-            stat_text = self.font_text.render(
-                f"{gene.name}: {gene.value}", True, C.GRAY
+            layer.add(
+                Label(
+                    f"{gene.name}: {gene.value}",
+                    (self.rect.x + 30, y_offset + 40 + i * 30),
+                    self.font_text,
+                    C.GRAY,
+                )
             )
-            screen.blit(stat_text, (self.rect.x + 30, y_offset + 40 + i * 30))
 
         # --- Traits Section ---
         y_offset += 40 + len(stat_genes) * 30  # Add space
-        traits_header = self.font_header.render("Traits", True, C.WHITE)
-        screen.blit(traits_header, (self.rect.x + 20, y_offset))
-
+        layer.add(Label("Traits", (self.rect.x + 20, y_offset), self.font_header))
         trait_genes = self.player.get_trait_genes()
         if not trait_genes:
-            no_traits_text = self.font_text.render("None", True, C.GRAY)
-            screen.blit(no_traits_text, (self.rect.x + 30, y_offset + 40))
+            layer.add(
+                Label("None", (self.rect.x + 30, y_offset + 40), self.font_text, C.GRAY)
+            )
         else:
             for i, gene in enumerate(trait_genes):
-                trait_text = self.font_text.render(f"- {gene.name}", True, C.GRAY)
-                screen.blit(trait_text, (self.rect.x + 30, y_offset + 40 + i * 30))
+                layer.add(
+                    Label(
+                        f"- {gene.name}",
+                        (self.rect.x + 30, y_offset + 40 + i * 30),
+                        self.font_text,
+                        C.GRAY,
+                    )
+                )
 
         # Gold Display (Left Column, below Attributes)
-        gold_text = self.font_text.render(
-            f"Gold: {self.player.gold}", True, (255, 223, 0)
+        layer.add(
+            Label(
+                f"Gold: {self.player.gold}",
+                (self.rect.x + 30, y_offset + 40 + 5 * 30),
+                self.font_text,
+                (255, 223, 0),
+            )
         )
-        screen.blit(gold_text, (self.rect.x + 30, y_offset + 40 + 5 * 30))
 
         # Experience Display (Left Column, below Gold)
-        exp_text = self.font_text.render(
-            f"Experience: {self.player.experience}", True, C.BLUE
+        layer.add(
+            Label(
+                f"Experience: {self.player.experience}",
+                (self.rect.x + 30, y_offset + 40 + 6 * 30),
+                self.font_text,
+                C.BLUE,
+            )
         )
-        screen.blit(exp_text, (self.rect.x + 30, y_offset + 40 + 6 * 30))
 
         # --- Equipped Weapon Section (Right Column) ---
         x_offset = self.rect.x + 300
         y_offset = self.rect.y + 80
-
-        weapon_header = self.font_header.render("Equipped Weapon", True, C.WHITE)
-        screen.blit(weapon_header, (x_offset, y_offset))
+        layer.add(Label("Equipped Weapon", (x_offset, y_offset), self.font_header))
 
         if self.player.equipped_weapon:
             weapon = self.player.equipped_weapon
-            y_offset += 40
-
-            # Weapon Name
-            name_text = self.font_text.render(f"{weapon.name}", True, C.WHITE)
-            screen.blit(name_text, (x_offset + 10, y_offset))
-            y_offset += 30
-
-            # Weapon Stats
-            dmg_text = self.font_text.render(
-                f"Damage: {weapon.base_damage[0]}-{weapon.base_damage[1]}", True, C.GRAY
-            )
-            screen.blit(dmg_text, (x_offset + 10, y_offset))
-            y_offset += 30
-
-            crit_text = self.font_text.render(
-                f"Crit Chance: {int(weapon.crit_chance * 100)}%", True, C.GRAY
-            )
-            screen.blit(crit_text, (x_offset + 10, y_offset))
-            y_offset += 30
-
-            crit_mult_text = self.font_text.render(
-                f"Crit Multiplier: x{weapon.crit_multiplier}", True, C.GRAY
-            )
-            screen.blit(crit_mult_text, (x_offset + 10, y_offset))
+            weapon_lines = [
+                (f"{weapon.name}", C.WHITE),
+                (f"Damage: {weapon.base_damage[0]}-{weapon.base_damage[1]}", C.GRAY),
+                (f"Crit Chance: {int(weapon.crit_chance * 100)}%", C.GRAY),
+                (f"Crit Multiplier: x{weapon.crit_multiplier}", C.GRAY),
+            ]
+            for i, (text, color) in enumerate(weapon_lines):
+                layer.add(
+                    Label(
+                        text,
+                        (x_offset + 10, y_offset + 40 + i * 30),
+                        self.font_text,
+                        color,
+                    )
+                )
         else:
             # If no weapon is equipped
-            no_weapon_text = self.font_text.render("None", True, C.GRAY)
-            screen.blit(no_weapon_text, (x_offset + 10, y_offset + 40))
+            layer.add(
+                Label("None", (x_offset + 10, y_offset + 40), self.font_text, C.GRAY)
+            )
 
         # --- Interactive Inventory Section ---
-        x_offset = self.rect.x + 300
         y_offset = self.rect.y + 280
-        inv_header = self.font_header.render("Inventory", True, C.WHITE)
-        screen.blit(inv_header, (x_offset, y_offset))
+        layer.add(Label("Inventory", (x_offset, y_offset), self.font_header))
         y_offset += 40
 
-        self.inventory_rects = []
+        self.inventory_rows = []
         if not self.player.inventory:
-            inv_text = self.font_text.render("Empty", True, C.GRAY)
-            screen.blit(inv_text, (x_offset + 10, y_offset))
-        else:
-            if self.selected_item_idx >= len(self.player.inventory):
-                self.selected_item_idx = len(self.player.inventory) - 1
-            for i, item in enumerate(self.player.inventory):
-                color = C.WHITE if i == self.selected_item_idx else C.GRAY
-                item_text = self.font_text.render(f"- {item.name}", True, color)
-                item_rect = screen.blit(item_text, (x_offset + 10, y_offset))
-                self.inventory_rects.append(item_rect)
-                y_offset += 30
-
-        # --- Draw Buttons ---
-        selected_item = (
-            self.player.inventory[self.selected_item_idx]
-            if self.player.inventory
-            else None
+            layer.add(Label("Empty", (x_offset + 10, y_offset), self.font_text, C.GRAY))
+        for i, item in enumerate(self.player.inventory):
+            row = Label(f"- {item.name}", (x_offset + 10, y_offset), self.font_text)
+            # Clicking a row selects that item
+            layer.add(row, on_click=lambda i=i: self._select_item(i))
+            self.inventory_rows.append(row)
+            y_offset += 30
+
+        # --- Buttons ---
+        layer.add(
+            self.equip_button,
+            on_click=lambda: self.game.get_active_state().equip_item(
+                self.selected_item_idx
+            ),
         )
+        layer.add(
+            self.use_button,
+            on_click=lambda: self.game.get_active_state().use_item(
+                self.selected_item_idx
+            ),
+        )
+        self._select_item(self.selected_item_idx)
+
+    def _select_item(self, item_index):
+        """Highlights an inventory row and enables the buttons that apply to it."""
+        inventory = self.player.inventory
+        self.selected_item_idx = max(0, min(item_index, len(inventory) - 1))
+        for i, row in enumerate(self.inventory_rows):
+            row.set_color(C.WHITE if i == self.selected_item_idx else C.GRAY)
+
+        selected_item = inventory[self.selected_item_idx] if inventory else None
         self.equip_button.is_disabled = not isinstance(selected_item, Weapon)
         self.use_button.is_disabled = not isinstance(selected_item, Consumable)
-        self.equip_button.draw(screen)
-        self.use_button.draw(screen)
+
+    def handle_event(self, event):
+        # Handle button and inventory row clicks
+        self.widgets.handle_event(event)
+
+        # Handle keyboard navigation for inventory
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self._select_item(self.selected_item_idx - 1)
+            elif event.key == pygame.K_DOWN:
+                self._select_item(self.selected_item_idx + 1)
+
+    def draw(self, screen):
+        # Draw background panel
+        pygame.draw.rect(screen, (30, 30, 40, 230), self.rect)
+        pygame.draw.rect(screen, C.WHITE, self.rect, 2)
+        self.widgets.draw(screen)
 
 
 class PauseMenu(UIElement):
@@ -402,7 +590,7 @@ class PauseMenu(UIElement):
         )
         super().__init__(rect)
         self.game = game
-        self.font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE)
 
         # Create buttons for the menu
         self.resume_button = Button(
@@ -458,17 +646,12 @@ class PauseMenu(UIElement):
             self.game.running = False
 
     def draw(self, screen):
-        # Draw a semi-transparent background for the whole screen
-        overlay = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
-
         # Draw the menu panel
         pygame.draw.rect(screen, (30, 30, 40), self.rect)
         pygame.draw.rect(screen, C.WHITE, self.rect, 2)
 
         # Draw title
-        title_text = self.font_title.render("Paused", True, C.WHITE)
+        title_text = render_text(self.font_title, "Paused", True, C.WHITE)
         title_rect = title_text.get_rect(centerx=self.rect.centerx, y=self.rect.y + 20)
         screen.blit(title_text, title_rect)
 
@@ -486,8 +669,8 @@ class MainMenu(UIElement):
         rect = pygame.Rect(0, 0, C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT)
         super().__init__(rect)
         self.game = game
-        self.font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE + 20)
-        self.font_button = pygame.font.Font(None, C.FONT_SIZE_TITLE)
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE + 20)
+        self.font_button = get_font(None, C.FONT_SIZE_TITLE)
 
         self.new_game_button = Button(
             self.rect.centerx - 150,
@@ -523,7 +706,7 @@ class MainMenu(UIElement):
             self.game.load_and_start_from_save()
 
     def draw(self, screen):
-        title_text = self.font_title.render("Legacy of the Cursed", True, C.WHITE)
+        title_text = render_text(self.font_title, "Legacy of the Cursed", True, C.WHITE)
         title_rect = title_text.get_rect(centerx=self.rect.centerx, y=self.rect.y + 100)
         screen.blit(title_text, title_rect)
 
@@ -540,45 +723,33 @@ class ShopUI(UIElement):
         self.game = game
         self.vendor = vendor
         self.player = player
-        self.font_header = pygame.font.Font(None, C.FONT_SIZE_HEADER)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
-        self.buy_buttons = []
-        self.sell_buttons = []
-
-    def handle_event(self, event):
-        for i, button in enumerate(self.buy_buttons):
-            if button.handle_event(event):
-                self.game.get_active_state().buy_item(i)
-                return  # Prevent multiple actions in one click
-
-        for i, button in enumerate(self.sell_buttons):
-            if button.handle_event(event):
-                self.game.get_active_state().sell_item(i)
-                return
-
-    def draw(self, screen):
-        # Draw a background for the whole screen
-        overlay = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        self.font_header = get_font(None, C.FONT_SIZE_HEADER)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
+        # Rows and buttons are built once and kept until an item or gold changes hands
+        self.widgets = WidgetLayer(self._build_widgets)
 
-        # Draw the main panel
-        pygame.draw.rect(screen, (30, 30, 40), self.rect)
-        pygame.draw.rect(screen, C.WHITE, self.rect, 2)
+    def invalidate(self):
+        """Rebuilds the shop on the next frame, e.g. after a purchase or sale."""
+        self.widgets.invalidate()
 
+    def _build_widgets(self, layer):
         # --- Vendor's Inventory ---
-        vendor_header = self.font_header.render(
-            f"{self.vendor.name}'s Wares", True, C.WHITE
+        layer.add(
+            Label(
+                f"{self.vendor.name}'s Wares",
+                (self.rect.x + 20, self.rect.y + 20),
+                self.font_header,
+            )
         )
-        screen.blit(vendor_header, (self.rect.x + 20, self.rect.y + 20))
-        self.buy_buttons = []
         y_offset = self.rect.y + 70
         for i, item in enumerate(self.vendor.inventory):
-            item_text = self.font_text.render(
-                f"{item.name} ({item.value}g)", True, C.WHITE
+            layer.add(
+                Label(
+                    f"{item.name} ({item.value}g)",
+                    (self.rect.x + 20, y_offset),
+                    self.font_text,
+                )
             )
-            screen.blit(item_text, (self.rect.x + 20, y_offset))
-
             buy_button = Button(
                 self.rect.x + 250,
                 y_offset - 5,
@@ -591,24 +762,37 @@ class ShopUI(UIElement):
             )
             if self.player.gold < item.value:
                 buy_button.is_disabled = True
-            self.buy_buttons.append(buy_button)
-            buy_button.draw(screen)
+            layer.add(
+                buy_button,
+                on_click=lambda i=i: self.game.get_active_state().buy_item(i),
+            )
             y_offset += 40
 
         # --- Player's Inventory ---
-        player_header = self.font_header.render("Your Inventory", True, C.WHITE)
-        screen.blit(player_header, (self.rect.centerx + 20, self.rect.y + 20))
-        player_gold = self.font_text.render(f"Gold: {self.player.gold}", True, C.GOLD)
-        screen.blit(player_gold, (self.rect.centerx + 20, self.rect.y + 50))
-
-        self.sell_buttons = []
+        layer.add(
+            Label(
+                "Your Inventory",
+                (self.rect.centerx + 20, self.rect.y + 20),
+                self.font_header,
+            )
+        )
+        layer.add(
+            Label(
+                f"Gold: {self.player.gold}",
+                (self.rect.centerx + 20, self.rect.y + 50),
+                self.font_text,
+                C.GOLD,
+            )
+        )
         y_offset = self.rect.y + 100
         for i, item in enumerate(self.player.inventory):
-            item_text = self.font_text.render(
-                f"{item.name} ({item.value // 2}g)", True, C.WHITE
-            )  # Sell for half price
-            screen.blit(item_text, (self.rect.centerx + 20, y_offset))
-
+            layer.add(
+                Label(
+                    f"{item.name} ({item.value // 2}g)",  # Sell for half price
+                    (self.rect.centerx + 20, y_offset),
+                    self.font_text,
+                )
+            )
             sell_button = Button(
                 self.rect.centerx + 250,
                 y_offset - 5,
@@ -619,23 +803,35 @@ class ShopUI(UIElement):
                 C.YELLOW,
                 C.GRAY,
             )
-            self.sell_buttons.append(sell_button)
-            sell_button.draw(screen)
+            layer.add(
+                sell_button,
+                on_click=lambda i=i: self.game.get_active_state().sell_item(i),
+            )
             y_offset += 40
 
+    def handle_event(self, event):
+        # Only the button under the cursor is checked, so one click is one action
+        self.widgets.handle_event(event)
+
+    def draw(self, screen):
+        # Draw the main panel
+        pygame.draw.rect(screen, (30, 30, 40), self.rect)
+        pygame.draw.rect(screen, C.WHITE, self.rect, 2)
+        self.widgets.draw(screen)
+
 
 class SettingsMenu(UIElement):
     """A UI component for the settings screen."""
 
     def __init__(self, game):
         rect = pygame.Rect(
-            C.INTERNAL_WIDTH / 2 - 200, C.INTERNAL_HEIGHT / 2 - 200, 400, 400
+            C.INTERNAL_WIDTH / 2 - 200, C.INTERNAL_HEIGHT / 2 - 230, 400, 460
         )
         super().__init__(rect)
         self.game = game
-        self.font_title = pygame.font.Font(None, C.FONT_SIZE_TITLE)
-        self.font_header = pygame.font.Font(None, C.FONT_SIZE_HEADER)
-        self.font_text = pygame.font.Font(None, C.FONT_SIZE_TEXT)
+        self.font_title = get_font(None, C.FONT_SIZE_TITLE)
+        self.font_header = get_font(None, C.FONT_SIZE_HEADER)
+        self.font_text = get_font(None, C.FONT_SIZE_TEXT)
 
         self.resolution_options = {
             "800 x 600": (800, 600),
@@ -658,6 +854,18 @@ class SettingsMenu(UIElement):
             self.res_buttons.append((button, size))
             y_offset += 60
 
+        self.filter_options = {"nearest": "Scaling: Sharp", "smooth": "Scaling: Smooth"}
+        self.filter_button = Button(
+            self.rect.centerx - 125,
+            y_offset,
+            250,
+            40,
+            self.filter_options[self.game.presenter.scale_filter],
+            self.font_text,
+            C.BLUE,
+            C.GRAY,
+        )
+
         self.back_button = Button(
             self.rect.centerx - 100,
             self.rect.bottom - 70,
@@ -677,20 +885,24 @@ class SettingsMenu(UIElement):
             if button.handle_event(event):
                 self.game.set_resolution(size)
 
+        if self.filter_button.handle_event(event):
+            # Cycle to the next filter option
+            filters = list(self.filter_options)
+            current = filters.index(self.game.presenter.scale_filter)
+            next_filter = filters[(current + 1) % len(filters)]
+            self.game.set_scale_filter(next_filter)
+            self.filter_button.text = self.filter_options[next_filter]
+
     def draw(self, screen):
-        # Draw background panel
-        overlay = pygame.Surface((C.INTERNAL_WIDTH, C.INTERNAL_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 220))
-        screen.blit(overlay, (0, 0))
         pygame.draw.rect(screen, (30, 30, 40), self.rect)
         pygame.draw.rect(screen, C.WHITE, self.rect, 2)
 
         # Draw title
-        title_text = self.font_title.render("Settings", True, C.WHITE)
+        title_text = render_text(self.font_title, "Settings", True, C.WHITE)
         title_rect = title_text.get_rect(centerx=self.rect.centerx, y=self.rect.y + 20)
         screen.blit(title_text, title_rect)
 
-        res_header = self.font_header.render("Resolution", True, C.WHITE)
+        res_header = render_text(self.font_header, "Resolution", True, C.WHITE)
         screen.blit(res_header, (self.rect.x + 20, self.rect.y + 70))
 
         # Draw buttons and highlight the current resolution
@@ -702,4 +914,5 @@ class SettingsMenu(UIElement):
                 button.is_disabled = False
             button.draw(screen)
 
+        self.filter_button.draw(screen)
         self.back_button.draw(screen)